@@ -1,12 +1,11 @@
 import streamlit as st
-import yfinance as yf
+import altair as alt
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import json
 import os
 import time
-import uuid
+
+from hunter import backtest, bootstrap, data_cache, equity, intraday, ledger, live_cache, metrics, result_cache, scanner, shared_store, signals, simulator, stops, sweep, timeframes
 
 # -----------------------------------------------------------------------------
 # 1. 페이지 설정 및 스타일
@@ -52,179 +51,84 @@ st.markdown("""
 check_years = 3
 
 # -----------------------------------------------------------------------------
-# 2. 데이터 가져오기 (RSI 계산 수식 수정됨 - Wilder's Smoothing 적용)
+# 2. 데이터 가져오기 (지표 계산은 hunter/indicators.py - Wilder's Smoothing 적용)
 # -----------------------------------------------------------------------------
-@st.cache_data(ttl=300)
 def get_data(ticker="SOXL"):
-    for attempt in range(5):
-        try:
-            t = yf.Ticker(ticker)
-            df = t.history(period=f"{check_years}y", interval="1d")
-            
-            if df.empty or len(df) < 20:
-                time.sleep(1)
-                df = yf.download(ticker, period=f"{check_years}y", interval="1d", progress=False)
+    # 프로세스 공유 stale-while-revalidate 캐시 (hunter/live_cache.py)
+    # 마지막 정상 프레임을 즉시 반환하고 갱신은 백그라운드 스레드에서 (반환 프레임은 읽기 전용)
+    return live_cache.get_frame(ticker, years=check_years)
 
-            if df.empty or len(df) < 20:
-                time.sleep(2)
-                continue
+# 서버 프로세스가 뜬 뒤 첫 실행에서 SOXL 갱신을 미리 시작
+live_cache.warm(["SOXL"], years=check_years)
 
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            # --- 기술적 지표 계산 ---
-            df['MA20'] = df['Close'].rolling(window=20).mean()
-            df['MA120'] = df['Close'].rolling(window=120).mean()
-            df['MA200'] = df['Close'].rolling(window=200).mean()
-            
-            df['BB_Mid'] = df['MA20']
-            df['BB_Std'] = df['Close'].rolling(window=20).std()
-            df['BB_Lower'] = df['BB_Mid'] - (2 * df['BB_Std'])
-            denom = (df['BB_Mid'] + (2 * df['BB_Std'])) - df['BB_Lower']
-            df['Pct_B'] = np.where(denom == 0, 0, (df['Close'] - df['BB_Lower']) / denom)
-
-            # [수정됨] RSI 계산 로직 (증권사 표준 Wilder's Smoothing 적용)
-            delta = df['Close'].diff()
-            
-            def calculate_rsi(data_delta, window):
-                # 1. 상승폭/하락폭 분리
-                gain = data_delta.where(data_delta > 0, 0)
-                loss = -data_delta.where(data_delta < 0, 0)
-                
-                # 2. 지수이동평균(EWM) 적용 (alpha = 1/window)
-                avg_gain = gain.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
-                avg_loss = loss.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
-                
-                # 3. RS & RSI 계산
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-                return rsi
-
-            # RSI 14, 5, 2 모두 표준 방식으로 계산
-            df['RSI'] = calculate_rsi(delta, 14)
-            df['RSI5'] = calculate_rsi(delta, 5)
-            df['RSI2'] = calculate_rsi(delta, 2)
-            
-            # Sigma 계산
-            df['Return'] = df['Close'].pct_change()
-            mean_20 = df['Return'].rolling(window=20).mean()
-            std_20 = df['Return'].rolling(window=20).std()
-            df['Sigma'] = (df['Return'] - mean_20) / std_20
-            
-            mean_60 = df['Return'].rolling(window=60).mean()
-            std_60 = df['Return'].rolling(window=60).std()
-            df['Sigma60'] = (df['Return'] - mean_60) / std_60
-            
-            df['VolMA20'] = df['Volume'].rolling(window=20).mean()
-            df['Vol_Ratio'] = df['Volume'] / df['VolMA20']
-            df['Is_Yangbong'] = df['Close'] > df['Open']
-            
-            return df
-        except:
-            time.sleep(1)
-            continue
-    return None
+def data_age_text(info):
+    if info["fetched_at"] is None:
+        return "디스크 캐시 데이터 (최신화 대기 중)"
+    minutes = int(info["age"] // 60)
+    if info["source"] == "disk":
+        return f"디스크 캐시 데이터 {info['fetched_at']:%m-%d %H:%M} 저장 ({minutes}분 전, 최신화 대기 중)"
+    return f"데이터 기준 {info['fetched_at']:%H:%M:%S} ({minutes}분 전)"
+
+@st.cache_data(ttl=300)
+def get_scan(tickers):
+    # 유니버스 전체를 한 번의 배치 요청 + 패널 연산으로 평가
+    return scanner.scan_universe(list(tickers), years=check_years)
+
+def signal_card(title, cls, msg, act, note):
+    return f"""
+    <div class="signal-box {cls}">
+        <div class="big-font">{title}</div>
+        <div class="sub-text">{msg}</div>
+        <hr class="custom-hr">
+        <div class="action-text">{act}</div>
+        <div class="note-text">{note}</div>
+    </div>
+    """
 
 # -----------------------------------------------------------------------------
-# 3. 지갑 및 포트폴리오 관리
+# 3. 지갑 및 포트폴리오 관리 (SQLite 장부)
 # -----------------------------------------------------------------------------
 WALLET_FILE = "my_wallet.json"
 PORTFOLIO_FILE = "my_portfolio.json"
 
-def load_json(file_path, default_data):
-    if not os.path.exists(file_path):
-        with open(file_path, "w") as f:
-            json.dump(default_data, f)
-        return default_data
-    try:
-        with open(file_path, "r") as f:
-            return json.load(f)
-    except:
-        return default_data
-
-def save_json(file_path, data):
-    with open(file_path, "w") as f:
-        json.dump(data, f)
-
-def load_wallet():
-    return load_json(WALLET_FILE, {"hunter_cash": 700.0, "blitz_cash": 300.0})
-
-def update_cash(strategy_type, amount, action):
-    data = load_wallet()
-    key = "blitz_cash" if strategy_type in ["Blitz", "블리츠"] else "hunter_cash"
-    
-    if action == "deposit": data[key] += amount
-    elif action == "buy": data[key] -= amount
-    elif action == "sell": data[key] += amount
-    elif action == "set": data[key] = amount
-        
-    save_json(WALLET_FILE, data)
-    return data
-
-def load_portfolio():
-    return load_json(PORTFOLIO_FILE, [])
-
-def add_trade(date, tier, price, qty):
-    data = load_portfolio()
-    new_trade = {
-        "id": str(uuid.uuid4()),
-        "date": date.strftime("%Y-%m-%d"),
-        "tier": tier,
-        "price": float(price),
-        "qty": int(qty),
-        "status": "holding",
-        "sell_price": 0.0,
-        "sell_date": ""
-    }
-    data.append(new_trade)
-    save_json(PORTFOLIO_FILE, data)
-
-def delete_trade(trade_id):
-    data = load_portfolio()
-    data = [t for t in data if t["id"] != trade_id]
-    save_json(PORTFOLIO_FILE, data)
-
-def sell_trade(trade_id, sell_price):
-    data = load_portfolio()
-    sold_info = None
-    for t in data:
-        if t["id"] == trade_id and t["status"] == "holding":
-            t["status"] = "sold"
-            t["sell_price"] = float(sell_price)
-            t["sell_date"] = datetime.now().strftime("%Y-%m-%d")
-            sold_info = t
-            break
-            
-    if sold_info:
-        total = sold_info["sell_price"] * sold_info["qty"]
-        w_type = "Blitz" if "블리츠" in sold_info["tier"] else "Hunter"
-        update_cash(w_type, total, "sell")
-        save_json(PORTFOLIO_FILE, data)
-        return True, total, w_type
-    return False, 0, ""
+# SQLite 장부 (hunter/ledger.py) 사용, 기존 JSON 파일은 최초 실행 시 1회 가져오기
+ledger.import_json(WALLET_FILE, PORTFOLIO_FILE)
 
 # -----------------------------------------------------------------------------
 # 4. 메인 앱 구조
 # -----------------------------------------------------------------------------
+# rerun 구간별 시간(및 선택 시 메모리) 계측 → 사이드바 디버그 패널 + hunter_metrics.jsonl
+run_metrics = metrics.RerunMetrics(memory=st.session_state.get("debug_memory", False))
+df = None
+
 try:
     st.sidebar.title("🦅 Hunter V6 System")
-    menu = st.sidebar.radio("📌 메뉴", ["🚀 SOXL 대시보드", "📜 과거 매매 기록", "📊 백테스트"])
+    menu = st.sidebar.radio("📌 메뉴", ["🚀 SOXL 대시보드", "📜 과거 매매 기록", "📊 백테스트", "🔎 유니버스 스캐너", "⏱️ 인트라데이"])
+    run_metrics.page = menu
     
     # 데이터 로드
-    df = get_data("SOXL")
+    df, data_info = get_data("SOXL")
+    run_metrics.cache_event("get_data", "miss" if df is None else ("stale" if data_info["stale"] else "hit"))
+    run_metrics.lap("데이터 로드")
     if df is None or len(df) < 2:
         st.error("데이터 연결 실패. 잠시 후 다시 시도하세요.")
         st.stop()
 
+    st.sidebar.caption(f"🕒 {data_age_text(data_info)}" + (" · 갱신 중…" if data_info["refreshing"] else ""))
+    if data_info["error"] and data_info["stale"]:
+        st.sidebar.warning(f"⚠️ 데이터 갱신 실패 ({data_info['failures']}회) - 마지막 정상 데이터를 표시 중")
+
     today = df.iloc[-1]
     prev = df.iloc[-2]
     current_price = today['Close']
 
     # --- 사이드바: 자산 관리 ---
-    portfolio_data = load_portfolio()
-    wallet = load_wallet()
+    # 사이드바/보유 자산에는 보유분만 필요 (status 인덱스), 전체 장부는 자산 추이에서만 읽음
+    holdings = ledger.load_holdings()
+    wallet = ledger.load_wallet()
+    run_metrics.lap("장부 읽기")
     
-    total_eval = sum([t['qty'] * current_price for t in portfolio_data if t['status'] == 'holding'])
+    total_eval = sum([t['qty'] * current_price for t in holdings])
     total_cash = wallet["hunter_cash"] + wallet["blitz_cash"]
     total_assets = total_eval + total_cash
     
@@ -239,12 +143,14 @@ try:
         deposit_type = st.radio("계좌 선택", ["Hunter", "Blitz"])
         deposit_amount = st.number_input("입금액 ($)", step=100)
         if st.button("입금 확인"):
-            update_cash(deposit_type, deposit_amount, "deposit")
+            ledger.update_cash(deposit_type, deposit_amount, "deposit")
             st.rerun()
             
     if st.sidebar.button("데이터/잔고 갱신"):
         st.cache_data.clear()
+        live_cache.refresh_frame("SOXL", years=check_years)
         st.rerun()
+    run_metrics.lap("사이드바")
 
     # =========================================================================
     # [PAGE 1] 대시보드
@@ -265,6 +171,17 @@ try:
         with c3: st.markdown(f"**RSI(14)**<br><span style='font-size:24px; font-weight:bold;'>{today['RSI']:.1f}</span>", unsafe_allow_html=True)
         with c4: st.markdown(f"**Volume**<br><span style='font-size:24px; font-weight:bold;'>{today['Vol_Ratio']:.2f}배</span>", unsafe_allow_html=True)
 
+        # 상위 타임프레임 (캐시된 일봉/인트라데이 봉을 리샘플링, 완성된 봉 기준)
+        mtf_now = timeframes.multi_timeframe(df, ("W", "M"), ("Sigma", "RSI"), ticker="SOXL").iloc[-1]
+        mtf_cards = [(f"{timeframes.TIMEFRAME_LABELS[tf]} {name}", mtf_now[f"{tf}_{col}"], fmt)
+                     for tf in ("W", "M") for name, col, fmt in (("Sigma", "Sigma", "{:.2f}"), ("RSI", "RSI", "{:.1f}"))]
+        intraday_bars = timeframes.load_intraday("SOXL")
+        if intraday_bars is not None and len(intraday_bars) > 0:
+            hour_now = timeframes.multi_timeframe(intraday_bars, ("1h",), ("RSI",), ticker="SOXL_1m").iloc[-1]
+            mtf_cards.append((f"{timeframes.TIMEFRAME_LABELS['1h']} RSI", hour_now["1h_RSI"], "{:.1f}"))
+        for col, (label, value, fmt) in zip(st.columns(len(mtf_cards)), mtf_cards):
+            col.metric(label, "-" if pd.isna(value) else fmt.format(value))
+
         st.markdown("---")
         st.subheader("📢 매수 신호 분석")
         
@@ -291,48 +208,13 @@ try:
         else: b_cls, b_msg, b_act, b_note = "hold", "조건 미충족", "-", f"RSI(2): {today['RSI2']:.1f} (목표 5↓)"
 
         c_d, c_g, c_s = st.columns(3)
-        with c_d:
-            st.markdown(f"""
-            <div class="signal-box {d_cls}">
-                <div class="big-font">💎 DIAMOND</div>
-                <div class="sub-text">{d_msg}</div>
-                <hr class="custom-hr">
-                <div class="action-text">{d_act}</div>
-                <div class="note-text">{d_note}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        with c_g:
-            st.markdown(f"""
-            <div class="signal-box {g_cls}">
-                <div class="big-font">🥇 GOLD</div>
-                <div class="sub-text">{g_msg}</div>
-                <hr class="custom-hr">
-                <div class="action-text">{g_act}</div>
-                <div class="note-text">{g_note}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        with c_s:
-            st.markdown(f"""
-            <div class="signal-box {s_cls}">
-                <div class="big-font">🥈 SILVER</div>
-                <div class="sub-text">{s_msg}</div>
-                <hr class="custom-hr">
-                <div class="action-text">{s_act}</div>
-                <div class="note-text">{s_note}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown(f"""
-        <div class="signal-box {b_cls}">
-            <div class="big-font">⚡ BLITZ</div>
-            <div class="sub-text">{b_msg}</div>
-            <hr class="custom-hr">
-            <div class="action-text">{b_act}</div>
-            <div class="note-text">{b_note}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        c_d.markdown(signal_card("💎 DIAMOND", d_cls, d_msg, d_act, d_note), unsafe_allow_html=True)
+        c_g.markdown(signal_card("🥇 GOLD", g_cls, g_msg, g_act, g_note), unsafe_allow_html=True)
+        c_s.markdown(signal_card("🥈 SILVER", s_cls, s_msg, s_act, s_note), unsafe_allow_html=True)
+        st.markdown(signal_card("⚡ BLITZ", b_cls, b_msg, b_act, b_note), unsafe_allow_html=True)
 
         st.info("💡 팁: 과거 성과와 15일 수익률 분석을 보려면 사이드바 메뉴에서 **'📊 백테스트 상세 분석'**을 선택하세요.")
+        run_metrics.lap("신호 판정")
 
         # =====================================================================
         # 차트 섹션
@@ -349,6 +231,7 @@ try:
             rsi_data = df[['RSI5', 'RSI']].iloc[-120:]
             st.line_chart(rsi_data, color=["#FF4B4B", "#1C83E1"])
             st.caption("🔴 빨강: RSI(5) - 단기 민감 | 🔵 파랑: RSI(14) - 중기 추세")
+        run_metrics.lap("차트")
 
         st.markdown("---")
         st.subheader("💼 현재 보유 자산")
@@ -360,29 +243,60 @@ try:
             i_price = c3.number_input("단가", 0.0, step=0.01)
             i_qty = c4.number_input("수량", 1, step=1)
             if st.button("저장하기"):
-                cost = i_price * i_qty
-                w = "Blitz" if "블리츠" in i_tier else "Hunter"
-                key = "blitz_cash" if w == "Blitz" else "hunter_cash"
-                if wallet[key] >= cost:
-                    update_cash(w, cost, "buy")
-                    add_trade(i_date, i_tier, i_price, i_qty)
+                # 잔고 확인 + 출금 + 거래 기록을 한 트랜잭션으로 처리
+                if ledger.buy_trade(i_date, i_tier, i_price, i_qty):
                     st.success("저장 완료")
                     st.rerun()
                 else: st.error("잔고 부족")
 
-        holdings = [t for t in portfolio_data if t['status'] == 'holding']
-        if holdings:
-            for t in holdings:
-                ts_txt = "-"
-                try:
-                    peak = df.loc[df.index.strftime('%Y-%m-%d') >= t['date']]['Close'].max()
-                    peak = max(peak, current_price) if not np.isnan(peak) else current_price
-                    if "다이아" in t['tier']: stop = peak * 0.6
-                    elif "골드" in t['tier']: stop = peak * 0.8
-                    elif "실버" in t['tier']: stop = peak * 0.85
-                    else: stop = t['price'] * 0.85
-                    ts_txt = f"${stop:.2f}"
-                except: pass
+        holding_view = st.radio("보기", ["📋 표 (일괄 매도)", "🗂️ 카드"], horizontal=True, label_visibility="collapsed")
+        if holdings and holding_view == "📋 표 (일괄 매도)":
+            # 모든 로트의 손익/스탑을 한 프레임으로 계산하고 표 하나로 렌더링
+            lots = stops.holdings_frame(holdings, stops.PeakIndex(df.index, df['Close']), current_price)
+            editor_df = lots.assign(선택=False, 매도가=float(current_price))[["선택", "매도가"] + stops.HOLDING_COLUMNS]
+            edited = st.data_editor(
+                editor_df,
+                # 로트 구성이 바뀔 때만 새 위젯 (가격 갱신은 데이터로 전달돼 선택/편집 유지)
+                key=f"holdings_editor_{hash(tuple(lots.index)):x}",
+                hide_index=True,
+                use_container_width=True,
+                disabled=stops.HOLDING_COLUMNS,
+                column_config={
+                    "선택": st.column_config.CheckboxColumn("선택"),
+                    "매도가": st.column_config.NumberColumn("매도가", format="$%.2f", min_value=0.0, step=0.01),
+                    "평단": st.column_config.NumberColumn(format="$%.2f"),
+                    "매입금액": st.column_config.NumberColumn(format="$%.2f"),
+                    "평가금액": st.column_config.NumberColumn(format="$%.2f"),
+                    "손익": st.column_config.NumberColumn(format="$%+.2f"),
+                    "수익률(%)": st.column_config.NumberColumn(format="%+.2f%%"),
+                    "고점": st.column_config.NumberColumn(format="$%.2f"),
+                    "스탑": st.column_config.NumberColumn(format="$%.2f"),
+                },
+            )
+            picked = edited[edited["선택"]]
+            b1, b2, _ = st.columns([1, 1, 4])
+            if b1.button(f"선택 매도 ({len(picked)})", type="primary", disabled=picked.empty):
+                # 선택한 로트 전체를 한 트랜잭션으로 매도 (지갑 입금 포함)
+                ledger.sell_trades(dict(zip(picked.index, picked["매도가"])))
+                st.rerun()
+            if b2.button(f"선택 삭제 ({len(picked)})", disabled=picked.empty):
+                ledger.delete_trades(list(picked.index))
+                st.rerun()
+
+            st.caption("등급별 합계")
+            st.dataframe(
+                stops.tier_totals(lots).style.format({"로트 수": "{:.0f}", "수량": "{:.0f}", "매입금액": "${:,.2f}", "평가금액": "${:,.2f}", "손익": "${:+,.2f}", "수익률(%)": "{:+.2f}%"}, na_rep="-"),
+                use_container_width=True,
+            )
+        elif holdings:
+            # 매수일 이후 최고가는 suffix max 로 O(1) 조회, 모든 로트의 스탑을 한 번에 계산
+            _, stop_arr = stops.stop_levels(
+                stops.PeakIndex(df.index, df['Close']),
+                [t['date'] for t in holdings], [t['tier'] for t in holdings], [t['price'] for t in holdings],
+                current_price,
+            )
+            for t, stop in zip(holdings, stop_arr):
+                ts_txt = f"${stop:.2f}" if not np.isnan(stop) else "-"
 
                 profit = (current_price - t['price']) * t['qty']
                 pct = (current_price - t['price']) / t['price'] * 100
@@ -399,13 +313,36 @@ try:
                         sell_price = st.number_input("매도가", value=float(current_price), key=f"p_{t['id']}", label_visibility="collapsed")
                         b1, b2 = st.columns(2)
                         if b1.button("매도", key=f"s_{t['id']}", type="primary"):
-                            sell_trade(t['id'], sell_price)
+                            ledger.sell_trade(t['id'], sell_price)
                             st.rerun()
                         if b2.button("삭제", key=f"d_{t['id']}"):
-                            delete_trade(t['id'])
+                            ledger.delete_trade(t['id'])
                             st.rerun()
         else:
             st.info("보유 중인 자산이 없습니다.")
+        run_metrics.lap("보유 자산")
+
+        portfolio_data = ledger.load_portfolio()
+        if portfolio_data:
+            st.markdown("---")
+            st.subheader("📈 계좌 평가 자산 추이")
+            # 장부 + 종가로 일별 예수금/평가액을 재구성 (장부·가격 해시로 캐시, 변경분만 재계산)
+            acct = equity.equity_curve(portfolio_data, wallet, df.index, df['Close'])
+            first_trade = min(t['date'] for t in portfolio_data)
+            acct = acct.loc[acct.index >= pd.Timestamp(first_trade) - pd.Timedelta(days=30)]
+            e1, e2, e3 = st.columns(3)
+            e1.metric("실현 손익", f"${acct['실현 손익'].iloc[-1]:+,.2f}")
+            e2.metric("미실현 손익", f"${acct['미실현 손익'].iloc[-1]:+,.2f}")
+            e3.metric("최대 낙폭", f"{acct['낙폭(%)'].min():.1f}%")
+            tab_eq, tab_pnl, tab_dd = st.tabs(["💰 총 자산", "📊 실현 vs 미실현", "📉 낙폭"])
+            with tab_eq:
+                st.line_chart(acct[["총 자산", "Hunter 예수금", "Blitz 예수금", "보유 평가액"]])
+            with tab_pnl:
+                st.line_chart(acct[["실현 손익", "미실현 손익"]], color=["#1C83E1", "#FF4B4B"])
+            with tab_dd:
+                st.area_chart(acct["낙폭(%)"], color="#4b88ff")
+            st.caption("입금 내역은 장부에 없으므로 과거 예수금은 현재 잔고에서 매매 현금흐름을 거꾸로 빼서 계산합니다.")
+            run_metrics.lap("자산 곡선")
 
     # =========================================================================
     # [PAGE 2] 과거 매매 기록
@@ -413,34 +350,24 @@ try:
     elif menu == "📜 과거 매매 기록":
         st.title("📜 매매 기록 일지 (Trade Log)")
         
-        portfolio_data = load_portfolio()
-        history = [t for t in portfolio_data if t['status'] == 'sold']
+        history = ledger.load_sold_frame()
         
         period_option = st.radio("📅 조회 기간", ["전체", "1개월", "3개월", "6개월", "1년"], horizontal=True)
+        period_days = {"1개월": 30, "3개월": 90, "6개월": 180, "1년": 365}
         
-        filtered_history = []
-        now = datetime.now()
-        
-        for t in history:
-            try:
-                sell_dt = datetime.strptime(t['sell_date'], "%Y-%m-%d")
-                if period_option == "1개월" and (now - sell_dt).days > 30: continue
-                if period_option == "3개월" and (now - sell_dt).days > 90: continue
-                if period_option == "6개월" and (now - sell_dt).days > 180: continue
-                if period_option == "1년" and (now - sell_dt).days > 365: continue
-                filtered_history.append(t)
-            except:
-                if period_option == "전체": filtered_history.append(t)
-
-        if filtered_history:
-            period_total_profit = 0
-            period_total_buy_amt = 0
-            
-            for t in filtered_history:
-                buy_amt = t['price'] * t['qty']
-                sell_amt = t['sell_price'] * t['qty']
-                period_total_buy_amt += buy_amt
-                period_total_profit += (sell_amt - buy_amt)
+        # 기간 필터: 한 번의 벡터 날짜 비교 (날짜를 읽을 수 없는 기록은 '전체'에서만 표시)
+        if period_option in period_days:
+            sell_dt = pd.to_datetime(history['sell_date'], format="%Y-%m-%d", errors="coerce")
+            cutoff = pd.Timestamp.now().normalize() - pd.Timedelta(days=period_days[period_option])
+            filtered = history[sell_dt >= cutoff]
+        else:
+            filtered = history
+
+        if len(filtered) > 0:
+            buy_amt = filtered['price'] * filtered['qty']
+            sell_amt = filtered['sell_price'] * filtered['qty']
+            period_total_buy_amt = buy_amt.sum()
+            period_total_profit = (sell_amt - buy_amt).sum()
             
             period_roi = (period_total_profit / period_total_buy_amt * 100) if period_total_buy_amt > 0 else 0
             roi_color = "red" if period_roi >= 0 else "blue"
@@ -448,15 +375,21 @@ try:
             sign = "+" if period_total_profit >= 0 else ""
 
             m1, m2, m3 = st.columns(3)
-            m1.markdown(f"<div style='text-align:left;'><h3>총 매매: {len(filtered_history)}건</h3></div>", unsafe_allow_html=True)
+            m1.markdown(f"<div style='text-align:left;'><h3>총 매매: {len(filtered)}건</h3></div>", unsafe_allow_html=True)
             m2.markdown(f"<div style='text-align:center; font-size:0.9rem; color:gray;'>실현 수익금</div><div style='text-align:center; font-size:1.6rem; font-weight:bold; color:{profit_color};'>{sign}${period_total_profit:,.2f}</div>", unsafe_allow_html=True)
             m3.markdown(f"<div style='text-align:center; font-size:0.9rem; color:gray;'>기간 수익률</div><div style='text-align:center; font-size:1.6rem; font-weight:bold; color:{roi_color};'>{sign}{period_roi:.2f}%</div>", unsafe_allow_html=True)
             st.markdown("---")
 
-            df_hist = pd.DataFrame(filtered_history)
-            edit_df = df_hist[['id', 'date', 'sell_date', 'tier', 'price', 'sell_price', 'qty']].copy()
-            edit_df['date'] = pd.to_datetime(edit_df['date']).dt.date
-            edit_df['sell_date'] = pd.to_datetime(edit_df['sell_date']).dt.date
+            # 페이지 단위로만 편집기에 올림 (수만 건이어도 한 번에 렌더링하는 행 수는 고정)
+            p1, p2 = st.columns([1, 3])
+            page_size = p1.selectbox("페이지당 행 수", [50, 100, 500], index=1)
+            n_pages = max(1, -(-len(filtered) // page_size))
+            page = p2.number_input(f"페이지 (총 {n_pages}쪽)", 1, n_pages, 1, step=1)
+            page_df = filtered.iloc[(page - 1) * page_size: page * page_size]
+
+            edit_df = page_df[['id', 'date', 'sell_date', 'tier', 'price', 'sell_price', 'qty']].reset_index(drop=True)
+            edit_df['date'] = pd.to_datetime(edit_df['date'], errors="coerce").dt.date
+            edit_df['sell_date'] = pd.to_datetime(edit_df['sell_date'], errors="coerce").dt.date
             
             column_config = {
                 "id": None,
@@ -470,86 +403,106 @@ try:
 
             st.caption("💡 표의 내용을 더블 클릭하여 직접 수정하거나, 행을 선택해 삭제할 수 있습니다. 수정 후 반드시 아래 '저장' 버튼을 눌러주세요.")
             
-            edited_data = st.data_editor(
+            editor_key = f"history_editor_{period_option}_{page}_{page_size}"
+            st.data_editor(
                 edit_df,
                 column_config=column_config,
                 hide_index=True,
                 use_container_width=True,
                 num_rows="dynamic",
-                key="history_editor"
+                key=editor_key
             )
 
             if st.button("💾 수정사항 저장 (Save Changes)", type="primary"):
-                current_portfolio = load_portfolio()
-                holdings = [t for t in current_portfolio if t['status'] == 'holding']
-                updated_history = []
-                for index, row in edited_data.iterrows():
-                    item = {
-                        "id": row['id'],
-                        "date": row['date'].strftime("%Y-%m-%d"),
-                        "tier": row['tier'],
-                        "price": float(row['price']),
-                        "qty": int(row['qty']),
-                        "status": "sold",
-                        "sell_price": float(row['sell_price']),
-                        "sell_date": row['sell_date'].strftime("%Y-%m-%d")
-                    }
-                    updated_history.append(item)
-                
-                final_data = holdings + updated_history
-                save_json(PORTFOLIO_FILE, final_data)
+                # data_editor 가 보고한 수정/추가/삭제 행만 저장
+                changes = st.session_state.get(editor_key, {})
+                ids = edit_df['id']
+                updates = {ids[int(i)]: fields for i, fields in changes.get("edited_rows", {}).items()}
+                deleted = [ids[int(i)] for i in changes.get("deleted_rows", [])]
+                skipped = ledger.apply_history_changes(updates, changes.get("added_rows", []), deleted)
+                if skipped:
+                    st.warning(f"필수 항목이 비어 있는 새 행 {skipped}건은 저장하지 않았습니다.")
                 st.success("매매 기록이 성공적으로 수정되었습니다!")
                 time.sleep(1)
                 st.rerun()
         else:
             st.info("선택한 기간에 해당하는 매매 기록이 없습니다.")
 
+        run_metrics.lap("매매 기록")
+
     # =========================================================================
     # [PAGE 3] 백테스트
     # =========================================================================
     elif menu == "📊 백테스트":
         st.title("📊 과거 수익률 분석")
+
+        data_mode = st.radio("데이터 범위", ["실제 SOXL (최근 3년)", "상장 전 합성 히스토리 포함"], horizontal=True)
+        bt_df = df
+        if data_mode == "상장 전 합성 히스토리 포함":
+            # 기초 반도체 ETF × 3 (매일 리셋, 보수/차입 비용 차감) 을 실제 SOXL 앞에 이어 붙인 시계열
+            ext_df, ext_info = live_cache.get_extended("SOXL")
+            if ext_df is None:
+                st.warning("합성 히스토리를 만들 수 없습니다 (기초자산과 SOXL 전체 기간 데이터가 필요). 실제 데이터로 계산합니다.")
+            else:
+                bt_df = ext_df
+                st.caption(f"{ext_df.attrs['synthetic_until']} 이전 {(ext_df.index < ext_df.attrs['synthetic_until']).sum():,}봉은 "
+                           f"{ext_df.attrs['params']['underlying']} × {ext_df.attrs['params']['leverage']} 합성 데이터입니다. · {data_age_text(ext_info)}")
+                with st.expander("🔬 합성 vs 실제 SOXL 괴리 (겹치는 구간)"):
+                    st.table(pd.Series(ext_df.attrs.get("deviation", {}), name="값").map(lambda v: f"{v:,.2f}" if isinstance(v, float) else v))
         
-        cond_dia = (df['Sigma'] <= -2.5) & (df['RSI'] < 30) & (df['Vol_Ratio'] >= 1.5)
-        cond_gold_std = (df['Sigma'] <= -2.0) & (df['RSI'] < 30) & (df['Vol_Ratio'] >= 1.5)
-        cond_gold_dual = (df['Sigma'] <= -1.8) & (df['Sigma60'] <= -2.0)
-        cond_gold = (cond_gold_std | cond_gold_dual) & (~cond_dia)
-        cond_silver = (df['RSI'] < 45) & (df['Pct_B'] < 0.2) & (df['Close'] > df['MA120']) & (df['Is_Yangbong']) & (~cond_dia) & (~cond_gold)
-        cond_blitz = (df['RSI2'] < 5) & (df['Close'] > df['MA200'])
-
-        history = []
-        all_signals = sorted(list(set(np.where(cond_dia)[0]) | set(np.where(cond_gold)[0]) | set(np.where(cond_silver)[0]) | set(np.where(cond_blitz)[0])))
-
-        for i in all_signals:
-            if i < 200 or i >= len(df)-1: continue 
-            date_str = df.index[i].strftime('%Y-%m-%d')
-            price_buy = df['Close'].iloc[i]
-            if cond_dia.iloc[i]: tier = "💎 다이아"
-            elif cond_gold.iloc[i]: tier = "🥇 골드"
-            elif cond_silver.iloc[i]: tier = "🥈 실버"
-            elif cond_blitz.iloc[i]: tier = "⚡ 블리츠"
-            else: tier = "기타"
-            
-            ret_5d = np.nan
-            ret_15d = np.nan
-            if i + 5 < len(df): ret_5d = ((df['Close'].iloc[i+5] - price_buy) / price_buy) * 100
-            if i + 15 < len(df): ret_15d = ((df['Close'].iloc[i+15] - price_buy) / price_buy) * 100
+        horizons = st.multiselect("📅 보유 기간 (거래일)", [1, 2, 3, 5, 10, 15, 20, 30, 60], default=[5, 15])
+        horizons = sorted(horizons) or list(backtest.DEFAULT_HORIZONS)
+
+        # 상위 타임프레임 확인: 일봉 신호 중 (완성된) 주봉/월봉 조건도 만족한 날만 남김
+        m1, m2, m3 = st.columns(3)
+        mtf_tf = m1.selectbox("상위 타임프레임 확인", ["없음", "W", "M"], format_func=lambda v: timeframes.TIMEFRAME_LABELS.get(v, v))
+        mtf_rsi = m2.slider("상위 RSI(14) 상한", 20, 70, 50, disabled=mtf_tf == "없음")
+        mtf_sigma = m3.slider("상위 Sigma(20) 상한", -3.0, 3.0, 3.0, 0.1, disabled=mtf_tf == "없음")
+        bt_masks, mtf_key = None, None
+        if mtf_tf != "없음":
+            # 이미 받은 일봉을 리샘플링 (추가 다운로드 없음), 티커@타임프레임 키로 새 봉만 증분 계산
+            ticker_key = "SOXL" if bt_df is df else "SOXL_EXT"
+            mtf = timeframes.multi_timeframe(bt_df, (mtf_tf,), ("Sigma", "RSI"), ticker=ticker_key)
+            bt_masks = timeframes.confirm_masks(signals.tier_masks(bt_df), mtf, mtf_tf, mtf_rsi, mtf_sigma)
+            mtf_key = (mtf_tf, mtf_rsi, mtf_sigma)
+            st.caption(f"각 날짜에는 그 날까지 완성된 마지막 {timeframes.TIMEFRAME_LABELS[mtf_tf]}의 값만 사용합니다 (미래 정보 없음).")
+
+        # 선행 수익률 행렬 / MFE·MAE / 등급 라벨 모두 한 번에 벡터 계산
+        # 결과는 가격 지문 + 보유 기간 + 규칙 + 코드 버전 키로 디스크 캐시 (hunter/result_cache.py)
+        price_key = result_cache.fingerprint(bt_df)
+        bt = result_cache.cached(
+            result_cache.make_key("backtest", price_key, tuple(horizons), signals.DEFAULT_RULES, mtf_key),
+            lambda: backtest.report(bt_df, horizons, bt_masks),
+        )
+        df_hist = bt["table"]
+
+        if len(df_hist) > 0:
+            ret_cols = [backtest.return_col(h) for h in horizons]
+
+            metric_cols = st.columns(1 + len(horizons))
+            metric_cols[0].metric("총 포착 신호", f"{len(df_hist)}회")
+            for col, h in zip(metric_cols[1:], horizons):
+                col.metric(f"{h}일 후 승률", f"{backtest.win_rate(df_hist, h):.1f}%")
             
-            history.append({"날짜": date_str, "등급": tier, "매수가": price_buy, "수익률(5일)": ret_5d, "수익률(15일)": ret_15d})
+            st.markdown("---")
+            st.subheader("🏷️ 등급별 성과")
+            summary = bt["summary"]
+            st.dataframe(summary.style.format("{:.2f}", na_rep="-").format({"신호 수": "{:d}"}), use_container_width=True)
+
+            with st.expander("🎲 승률 / 평균 수익률 신뢰구간 (부트스트랩)"):
+                st.caption("신호가 드문 등급은 승률이 몇 개 표본에 좌우됩니다. 블록 부트스트랩은 겹치는 보유 기간의 자기상관을 반영해 구간을 더 보수적으로 잡습니다.")
+                b1, b2, b3 = st.columns(3)
+                boot_n = b1.selectbox("재표본 수", [1000, 5000, 10000, 20000], index=2, key="boot_n")
+                boot_conf = b2.selectbox("신뢰수준", [0.9, 0.95, 0.99], index=1, format_func=lambda v: f"{v:.0%}", key="boot_conf")
+                boot_block = b3.checkbox("블록 부트스트랩", value=True, key="boot_block")
+                # 신호 표(가격 + 보유 기간 + 타임프레임 필터)와 재표본 설정이 모두 같을 때만 이전 결과 표시
+                boot_key = (price_key, tuple(horizons), mtf_key, boot_n, boot_conf, boot_block)
+                if st.button("신뢰구간 계산"):
+                    st.session_state["boot_tiers"] = (boot_key, bootstrap.tier_intervals(df_hist, horizons, boot_n, boot_block, boot_conf))
+                if st.session_state.get("boot_tiers", (None,))[0] == boot_key:
+                    ci = st.session_state["boot_tiers"][1]
+                    st.dataframe(ci.style.format("{:.1f}", na_rep="-").format({f"표본({h}일)": "{:d}" for h in horizons}), use_container_width=True)
 
-        if history:
-            df_hist = pd.DataFrame(history).sort_values("날짜", ascending=False)
-            
-            valid_5d = df_hist.dropna(subset=['수익률(5일)'])
-            valid_15d = df_hist.dropna(subset=['수익률(15일)'])
-            rate_5d = (valid_5d['수익률(5일)'] > 0).mean() * 100 if len(valid_5d) > 0 else 0
-            rate_15d = (valid_15d['수익률(15일)'] > 0).mean() * 100 if len(valid_15d) > 0 else 0
-            
-            m1, m2, m3 = st.columns(3)
-            m1.metric("총 포착 신호", f"{len(df_hist)}회")
-            m2.metric("5일 후 승률", f"{rate_5d:.1f}%")
-            m3.metric("15일 후 승률", f"{rate_15d:.1f}%")
-            
             st.markdown("---")
             
             def color_returns(val):
@@ -557,16 +510,216 @@ try:
                 color = '#ff4b4b' if val > 0 else '#4b88ff'
                 return f'color: {color}; font-weight: bold;'
 
-            st.dataframe(df_hist.style.format({"매수가": "${:.2f}", "수익률(5일)": "{:+.2f}%", "수익률(15일)": "{:+.2f}%"}, na_rep="-").map(color_returns, subset=['수익률(5일)', '수익률(15일)']), use_container_width=True, hide_index=True)
+            pct_cols = ret_cols + ["MFE(%)", "MAE(%)"]
+            fmt = {"매수가": "${:.2f}", **{c: "{:+.2f}%" for c in pct_cols}}
+            st.dataframe(df_hist.style.format(fmt, na_rep="-").map(color_returns, subset=pct_cols), use_container_width=True, hide_index=True)
             
-            csv = df_hist.to_csv(index=False).encode('utf-8-sig')
-            st.download_button("📊 전체 데이터 다운로드 (CSV)", csv, "soxl_backtest.csv", "text/csv")
+            st.download_button("📊 전체 데이터 다운로드 (CSV)", bt["csv"], "soxl_backtest.csv", "text/csv")
         else:
             st.write("신호 없음")
+        run_metrics.lap("백테스트 표")
+
+        # --- 포트폴리오 시뮬레이션 ---
+        st.markdown("---")
+        with st.expander("💼 포트폴리오 시뮬레이션 (실전 매매 규칙 재생)"):
+            st.caption("다이아 80% / 골드 50% / 실버 20% 비중, 다이아 5일 강제 보유, 트레일링 스탑(고점 × 0.6 / 0.8 / 0.85), 블리츠는 별도 예수금으로 매수가 × 0.85 손절.")
+            s1, s2, s3 = st.columns(3)
+            sim_hunter = s1.number_input("Hunter 시작 예수금 ($)", 0.0, value=700.0, step=100.0)
+            sim_blitz = s2.number_input("Blitz 시작 예수금 ($)", 0.0, value=300.0, step=100.0)
+            sim_blitz_hold = s3.number_input("블리츠 최대 보유일 (0 = 제한 없음)", 0, value=0, step=1)
+
+            sim_key = result_cache.make_key("simulate", price_key, sim_hunter, sim_blitz, int(sim_blitz_hold), signals.DEFAULT_RULES, mtf_key)
+            curve, sim_trades, sim_stats = result_cache.cached(
+                sim_key,
+                lambda: simulator.simulate(bt_df, sim_hunter, sim_blitz, max_hold={"blitz": int(sim_blitz_hold)},
+                                           codes=signals.tier_codes(bt_masks) if bt_masks is not None else None),
+            )
+            k1, k2, k3, k4, k5 = st.columns(5)
+            k1.metric("최종 자산", f"${sim_stats['최종 자산']:,.0f}", f"{sim_stats['총 수익률(%)']:+.1f}%")
+            k2.metric("CAGR", f"{sim_stats['CAGR(%)']:.1f}%")
+            k3.metric("최대 낙폭", f"{sim_stats['최대 낙폭(%)']:.1f}%")
+            k4.metric("거래 수", f"{sim_stats['거래 수']}회")
+            k5.metric("승률", f"{sim_stats['승률(%)']:.1f}%" if not pd.isna(sim_stats['승률(%)']) else "-")
+
+            if st.button("📉 자산 곡선 지표 신뢰구간 (블록 부트스트랩)"):
+                st.session_state["boot_equity"] = (sim_key, bootstrap.equity_intervals(curve["총 자산"], simulator.years_between(bt_df.index)))
+            if st.session_state.get("boot_equity", (None,))[0] == sim_key:
+                st.dataframe(st.session_state["boot_equity"][1].style.format("{:.1f}"), use_container_width=True)
+
+            st.line_chart(curve[["총 자산", "Hunter 예수금", "Blitz 예수금"]])
+            st.area_chart(curve["낙폭(%)"], color="#4b88ff")
+            st.dataframe(sim_trades.style.format({"매수가": "${:.2f}", "매도가": "${:.2f}", "수익률(%)": "{:+.2f}%"}, na_rep="-"), use_container_width=True, hide_index=True)
+
+        run_metrics.lap("시뮬레이션")
+
+        # --- 파라미터 스윕 ---
+        st.markdown("---")
+        with st.expander("🧪 파라미터 스윕 (임계값 민감도 분석)"):
+            st.caption("각 항목에 쉼표로 여러 값을 입력하면 모든 조합을 병렬로 평가합니다. 지표는 기간별로 한 번만 계산됩니다.")
+            grid_defaults = {
+                "dia_sigma": "-3.0, -2.5, -2.0", "gold_sigma": "-2.5, -2.0, -1.5", "gold_dual_sigma": "-1.8",
+                "gold_dual_sigma60": "-2.0", "rsi_oversold": "25, 30, 35", "vol_ratio": "1.2, 1.5, 2.0",
+                "silver_rsi": "40, 45, 50", "silver_pct_b": "0.1, 0.2, 0.3", "blitz_rsi2": "3, 5, 10",
+                "rsi_window": "14", "sigma_window": "20", "vol_window": "20",
+            }
+            grid_cols = st.columns(3)
+            grid = {}
+            for n, (name, default) in enumerate(grid_defaults.items()):
+                raw = grid_cols[n % 3].text_input(name, default, key=f"sweep_{name}")
+                cast = int if name.endswith("_window") else float
+                try:
+                    grid[name] = [cast(v) for v in raw.split(",") if v.strip()] or [cast(default.split(",")[0])]
+                except ValueError:
+                    st.error(f"{name}: 숫자 목록을 입력하세요.")
+                    grid[name] = [cast(default.split(",")[0])]
+            sweep_h = st.selectbox("평가 보유 기간 (일)", horizons, key="sweep_horizon")
+            sweep_portfolio = st.checkbox("포트폴리오 시뮬레이션 지표(CAGR / 최대 낙폭) 포함", value=False)
+
+            n_combo = int(np.prod([len(v) for v in grid.values()]))
+            if st.button(f"🚀 스윕 실행 ({n_combo:,}개 조합)"):
+                t0 = time.time()
+                st.session_state["sweep_result"] = sweep.run_sweep(bt_df, grid, [sweep_h], portfolio=sweep_portfolio)
+                st.session_state["sweep_meta"] = (sweep_h, [k for k, v in grid.items() if len(v) > 1], time.time() - t0)
+
+            if "sweep_result" in st.session_state:
+                res = st.session_state["sweep_result"]
+                res_h, varied, elapsed = st.session_state["sweep_meta"]
+                st.success(f"{len(res) // 4:,}개 조합 평가 완료 ({elapsed:.2f}초)")
+
+                if len(varied) >= 2:
+                    h1, h2, h3, h4 = st.columns(4)
+                    hm_tier = h1.selectbox("등급", [signals.TIER_LABELS[t] for t in signals.TIERS], key="hm_tier")
+                    hm_x = h2.selectbox("X축", varied, index=0, key="hm_x")
+                    hm_y = h3.selectbox("Y축", varied, index=1, key="hm_y")
+                    hm_val = h4.selectbox("값", [c for c in [f"승률({res_h}일)", f"평균({res_h}일)", "CAGR(%)", "최대 낙폭(%)"] if c in res.columns], key="hm_val")
+                    pivot = sweep.heatmap_table(res, hm_tier, hm_x, hm_y, hm_val)
+                    hm_data = pivot.stack().rename(hm_val).reset_index()
+                    chart = alt.Chart(hm_data).mark_rect().encode(
+                        x=alt.X(f"{hm_x}:O"), y=alt.Y(f"{hm_y}:O"),
+                        color=alt.Color(f"{hm_val}:Q", scale=alt.Scale(scheme="redblue", reverse=True)),
+                        tooltip=[hm_x, hm_y, alt.Tooltip(f"{hm_val}:Q", format=".2f")],
+                    )
+                    st.altair_chart(chart, use_container_width=True)
+
+                st.dataframe(res, use_container_width=True, hide_index=True)
+
+        run_metrics.lap("파라미터 스윕")
+
+    # =========================================================================
+    # [PAGE 4] 유니버스 스캐너
+    # =========================================================================
+    elif menu == "🔎 유니버스 스캐너":
+        st.title("🔎 레버리지 ETF 신호 스캐너")
+
+        universe_txt = st.text_area("티커 목록 (쉼표/줄바꿈 구분)", ", ".join(scanner.DEFAULT_UNIVERSE), height=120)
+        tickers = tuple(dict.fromkeys(t.strip().upper() for t in universe_txt.replace("\n", ",").split(",") if t.strip()))
+        only_signals = st.checkbox("신호 발생 티커만 보기", value=True)
+
+        scan = get_scan(tickers) if tickers else None
+        if scan is None or scan.empty:
+            st.warning("스캔 결과가 없습니다. 티커 목록이나 데이터 연결을 확인하세요.")
+        else:
+            hits = scan[scan["Tier"] != "-"]
+            m1, m2 = st.columns(2)
+            m1.metric("스캔 티커", f"{len(scan)}개")
+            m2.metric("오늘 신호", f"{len(hits)}개")
+
+            view = hits if only_signals else scan
+            st.dataframe(
+                view.reset_index().style.format({"Close": "${:.2f}", "Return": "{:+.2%}", "Sigma": "{:.2f}", "Sigma60": "{:.2f}", "RSI": "{:.1f}", "RSI2": "{:.1f}", "Vol_Ratio": "{:.2f}배", "Pct_B": "{:.2f}", "Date": "{:%Y-%m-%d}"}, na_rep="-"),
+                use_container_width=True, hide_index=True
+            )
+
+        run_metrics.lap("스캐너")
+
+    # =========================================================================
+    # [PAGE 5] 인트라데이
+    # =========================================================================
+    elif menu == "⏱️ 인트라데이":
+        st.title("⏱️ 인트라데이 실시간 신호")
+
+        i1, i2, i3 = st.columns(3)
+        source_type = i1.radio("데이터 소스", ["실시간 (Yahoo)", "녹화 파일 재생"], horizontal=True)
+        interval = i2.selectbox("봉 간격", intraday.INTERVALS)
+        refresh_sec = i3.number_input("갱신 주기 (초)", 1, 300, 5 if source_type == "실시간 (Yahoo)" else 1)
+        record_path = os.path.join(data_cache.CACHE_DIR, f"SOXL_{interval}.parquet")
+        if source_type == "녹화 파일 재생":
+            r1, r2 = st.columns([3, 1])
+            replay_path = r1.text_input("봉 파일 경로 (.parquet / .csv)", record_path)
+            replay_speed = r2.number_input("재생 배속 (0 = 즉시)", 0.0, value=60.0, step=10.0)
+
+        if st.button("▶️ 세션 시작 / 재시작", type="primary"):
+            if source_type == "실시간 (Yahoo)":
+                source = intraday.YahooIntradaySource("SOXL", interval)
+            else:
+                source = intraday.ReplaySource(intraday.load_bars(replay_path), speed=replay_speed)
+            st.session_state["intraday_source"] = source
+            st.session_state["intraday_session"] = intraday.IntradaySession()
+
+        card_cls = {"dia": "diamond", "gold": "gold", "silver": "silver", "blitz": "blitz"}
+        card_title = {"dia": "💎 DIAMOND", "gold": "🥇 GOLD", "silver": "🥈 SILVER", "blitz": "⚡ BLITZ"}
+
+        # 타이머마다 이 영역만 다시 그림 (페이지 전체 rerun 없음)
+        @st.fragment(run_every=refresh_sec)
+        def intraday_panel():
+            session = st.session_state.get("intraday_session")
+            source = st.session_state.get("intraday_source")
+            if session is None:
+                st.info("세션을 시작하면 카드가 자동으로 갱신됩니다.")
+                return
+            session.feed(source.poll(), warmup=source.warmup)
+            row = session.latest
+            if row is None:
+                st.warning("봉 데이터를 기다리는 중...")
+                return
+
+            st.caption(f"마지막 봉: {session.last_ts:%Y-%m-%d %H:%M} · 종가 ${row['Close']:.2f}" + (" · 재생 완료" if source.done else ""))
+            note = f"Sigma {row['Sigma']:.2f} · RSI {row['RSI']:.1f} · RSI(2) {row['RSI2']:.1f}"
+            cols = st.columns(4)
+            for col, tier in zip(cols, signals.TIERS):
+                on = session.states[tier]
+                col.markdown(signal_card(card_title[tier], card_cls[tier] if on else "hold", "조건 충족" if on else "조건 미충족", "신호 ON" if on else "-", note), unsafe_allow_html=True)
+
+            stats = session.stats()
+            s1, s2, s3, s4 = st.columns(4)
+            s1.metric("처리한 봉", f"{stats['업데이트 수']:,}")
+            s2.metric("지연 p50", f"{stats['지연 p50(µs)']:.0f}µs")
+            s3.metric("지연 p95", f"{stats['지연 p95(µs)']:.0f}µs")
+            s4.metric("처리량", f"{stats['처리량(봉/초)']:,.0f}봉/초")
+
+            st.line_chart(session.frame()['Close'].iloc[-240:], color="#29b5e8")
+            if session.flips:
+                st.subheader("🔔 세션 중 등급 전환")
+                st.dataframe(pd.DataFrame(session.flips[::-1]), use_container_width=True, hide_index=True)
+
+        intraday_panel()
+
+        if st.session_state.get("intraday_session") is not None and st.button("💾 현재 세션 봉 저장 (재생용)"):
+            os.makedirs(data_cache.CACHE_DIR, exist_ok=True)
+            intraday.save_bars(st.session_state["intraday_session"].frame()[data_cache.OHLCV_COLUMNS], record_path)
+            st.success(f"저장 완료: {record_path}")
+        run_metrics.lap("인트라데이")
 
 except Exception as e:
     st.error(f"오류: {e}")
 
+finally:
+    # st.stop / st.rerun 으로 끝난 rerun 도 기록
+    rerun_record = run_metrics.finish()
+    with st.sidebar.expander("🛠️ 디버그: rerun 계측"):
+        st.checkbox("tracemalloc 메모리 측정 (느려짐)", key="debug_memory")
+        st.caption(f"이번 rerun {rerun_record['total_ms']:.0f} ms · get_data 캐시: {rerun_record['cache'].get('get_data', '-')}")
+        if df is not None:
+            st.caption(f"공유 시세 프레임 {shared_store.nbytes(df) / 1024:,.0f} KB ({'float32 압축' if shared_store.COMPACT else 'float64'}, 세션 간 공유)")
+        st.dataframe(
+            pd.DataFrame({"ms": rerun_record["stages"], "peak KB": rerun_record.get("peak_kb", {})}).style.format("{:.1f}", na_rep="-"),
+            use_container_width=True,
+        )
+        if st.checkbox("누적 p50/p95 보기", key="debug_summary"):
+            records = metrics.load_records()
+            st.dataframe(metrics.latency_summary(records).style.format("{:.1f}", na_rep="-").format({"rerun 수": "{:d}"}), use_container_width=True)
+            st.caption(f"get_data 캐시 적중률 {metrics.cache_hit_rate(records, 'get_data'):.0f}% · {len(records)}회 · {metrics.METRICS_FILE}")
+
 
 
 
@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from hunter import backtest, data_cache, indicators, ledger, scanner, signals, simulator  # noqa: E402
+
+# -----------------------------------------------------------------------------
+# 오프라인 벤치마크: 지표 / 등급 마스크 / 백테스트 / 시뮬레이션 / 스캐너 / 장부
+#   python -m benchmarks.run            # 실행 후 baseline.json 과 비교 (느려지면 종료 코드 1)
+#   python -m benchmarks.run --save     # 현재 결과를 기준선으로 저장
+#   python -m benchmarks.run --only ledger --repeat 5
+# 시간은 repeat 회 중 최솟값(ms), 메모리는 tracemalloc 으로 따로 1회 측정한 최대치(KB)
+# -----------------------------------------------------------------------------
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PRICE_SIZES = {"3y": 3, "30y": 30}
+LEDGER_SIZES = {"10": 10, "10k": 10_000, "100k": 100_000}
+TOLERANCE = 0.25
+NOISE_MS = 1.0
+
+
+# --- 벤치 정의: (이름, setup, fn) — setup 결과(인자 튜플)는 측정에서 제외 ---
+# 공용 데이터는 처음 쓰는 setup 에서 한 번만 만듦 (--only 로 거른 벤치는 준비 비용도 없음)
+def _once(build):
+    cache = []
+
+    def get():
+        if not cache:
+            cache.append(build())
+        return cache[0]
+    return get
+
+
+def price_benches(label, years):
+    def build():
+        raw = synthetic.make_ohlcv(years)
+        ind = indicators.add_indicators(raw.copy())  # add_indicators 는 입력 프레임에 열을 추가함
+        return raw, ind, signals.tier_masks(ind)
+    data = _once(build)
+
+    def incremental_setup():
+        raw = data()[0]
+        state = indicators.IncrementalIndicators()
+        state.extend(raw.iloc[:-1])
+        return state, raw
+
+    return [
+        (f"indicators.full[{label}]", lambda: (data()[0].copy(),), indicators.add_indicators),
+        (f"indicators.new_bar[{label}]", incremental_setup, lambda state, r: state.extend(r)),
+        (f"signals.masks[{label}]", lambda: (data()[1],), lambda d: signals.tier_codes(signals.tier_masks(d))),
+        (f"backtest.table[{label}]", lambda: data()[1:],
+         lambda d, m: backtest.tier_summary(backtest.signal_table(d, masks=m))),
+        (f"simulator.run[{label}]", lambda: (data()[1],), simulator.simulate),
+    ]
+
+
+def universe_benches():
+    tickers = scanner.DEFAULT_UNIVERSE
+
+    def build():
+        panel = data_cache.to_panel(synthetic.make_universe(tickers))
+        return panel, indicators.panel_indicators(panel)
+    data = _once(build)
+
+    label = f"{len(tickers)}x3y"
+    return [
+        (f"indicators.panel[{label}]", lambda: (data()[0],), indicators.panel_indicators),
+        (f"scanner.scan[{label}]", lambda: (data()[0],), scanner.scan_panel),
+        (f"signals.masks[{label}]", lambda: (data()[1],), lambda p: signals.tier_codes(signals.tier_masks(p))),
+    ]
+
+
+def ledger_benches(label, n, workdir):
+    portfolio_file = os.path.join(workdir, f"portfolio_{label}.json")
+    wallet_file = os.path.join(workdir, "wallet.json")
+
+    def fresh_db():
+        return os.path.join(workdir, f"ledger_{uuid.uuid4().hex}.db")
+
+    def build():
+        trades = synthetic.make_trades(n)
+        with open(portfolio_file, "w") as f:
+            json.dump(trades, f)
+        with open(wallet_file, "w") as f:
+            json.dump({"hunter_cash": 1e9, "blitz_cash": 1e9}, f)
+        db = fresh_db()
+        ledger.import_json(wallet_file, portfolio_file, path=db)
+        sold_ids = [t["id"] for t in trades if t["status"] == "sold"][:100]
+        return db, {i: {"sell_price": 50.0} for i in sold_ids}
+    data = _once(build)
+
+    trade_date = synthetic.make_ohlcv(1).index[-1]  # 측정 구간 밖에서 한 번만
+
+    def buy_sell(path):
+        trade_id = ledger.buy_trade(trade_date, "🥇 골드", 40.0, 1, path=path)
+        ledger.sell_trade(trade_id, 42.0, path=path)
+
+    def import_setup():
+        data()
+        return wallet_file, portfolio_file, fresh_db()
+
+    return [
+        (f"ledger.import[{label}]", import_setup, lambda w, p, path: ledger.import_json(w, p, path=path)),
+        (f"ledger.load[{label}]", lambda: (data()[0],),
+         lambda path: (ledger.load_wallet(path), ledger.load_holdings(path), ledger.load_sold_frame(path))),
+        (f"ledger.buy_sell[{label}]", lambda: (data()[0],), buy_sell),
+        (f"ledger.edit_history[{label}]", lambda: (data()[0],),
+         lambda path: ledger.apply_history_changes(data()[1], [], [], path=path)),
+    ]
+
+
+# --- 측정 ---
+def measure(setup, fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+
+    args = setup()
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_ms": best * 1000, "peak_kb": peak / 1024}
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    # 기준선 대비 (1 + tolerance) 배 이상 느려지고 잡음 한계(NOISE_MS)를 넘으면 회귀
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = res["wall_ms"] / base["wall_ms"] if base["wall_ms"] > 0 else float("inf")
+        res["vs_baseline"] = ratio
+        if ratio > 1 + tolerance and res["wall_ms"] - base["wall_ms"] > NOISE_MS:
+            regressions.append(name)
+    return regressions
+
+
+def report(results, regressions):
+    lines = [f"{'bench':<34}{'wall(ms)':>12}{'peak(KB)':>12}{'vs base':>10}"]
+    for name, res in results.items():
+        ratio = res.get("vs_baseline")
+        flag = "  << REGRESSION" if name in regressions else ""
+        ratio_text = f"{ratio:>9.2f}x" if ratio is not None else f"{'-':>10}"
+        lines.append(f"{name:<34}{res['wall_ms']:>12.2f}{res['peak_kb']:>12.0f}{ratio_text}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hunter 오프라인 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="이름에 이 문자열이 들어간 벤치만 실행")
+    parser.add_argument("--save", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        benches = []
+        for label, years in PRICE_SIZES.items():
+            benches += price_benches(label, years)
+        benches += universe_benches()
+        for label, n in LEDGER_SIZES.items():
+            benches += ledger_benches(label, n, workdir)
+
+        results = {}
+        for name, setup, fn in benches:
+            if args.only and args.only not in name:
+                continue
+            results[name] = measure(setup, fn, args.repeat)
+            print(f"  {name}: {results[name]['wall_ms']:.2f} ms", file=sys.stderr)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+    print(report(results, regressions))
+
+    if args.save:
+        baseline.update({k: {"wall_ms": v["wall_ms"], "peak_kb": v["peak_kb"]} for k, v in results.items()})
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(), "results": baseline}, f, indent=2)
+        print(f"기준선 저장: {args.baseline}")
+    elif regressions:
+        print(f"회귀 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 벤치마크용 결정적 합성 데이터 (네트워크 불필요)
+# - OHLCV: 시드 고정 로그정규 랜덤워크 (3x 레버리지 ETF 수준의 일간 변동성)
+# - 장부: 보유/매도 혼합 거래 목록 (my_portfolio.json 형식)
+# -----------------------------------------------------------------------------
+BARS_PER_YEAR = 252
+
+
+def make_ohlcv(years=3, seed=0, start="1995-01-02", daily_vol=0.04):
+    rng = np.random.default_rng(seed)
+    n = int(years * BARS_PER_YEAR)
+    index = pd.bdate_range(start, periods=n, name="Date")
+    close = 50 * np.exp(np.cumsum(rng.normal(0, daily_vol, n)))
+    open_ = close * (1 + rng.normal(0, daily_vol / 4, n))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, daily_vol / 2, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, daily_vol / 2, n))
+    volume = rng.integers(1_000_000, 50_000_000, n).astype(float)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def make_universe(tickers, years=3):
+    return {t: make_ohlcv(years, seed=i + 1) for i, t in enumerate(tickers)}
+
+
+def make_trades(n, seed=0, start="2015-01-02"):
+    rng = np.random.default_rng(seed)
+    labels = ["💎 다이아", "🥇 골드", "🥈 실버", "⚡ 블리츠", "기타"]
+    days = pd.bdate_range(start, periods=2000)
+    buy = rng.integers(0, len(days) - 30, n)
+    hold = rng.integers(1, 30, n)
+    price = rng.uniform(10, 80, n).round(2)
+    sold = rng.random(n) < 0.9
+    trades = []
+    for i in range(n):
+        trades.append({
+            "id": f"bench-{i}",
+            "date": days[buy[i]].strftime("%Y-%m-%d"),
+            "tier": labels[i % len(labels)],
+            "price": float(price[i]),
+            "qty": int(rng.integers(1, 20)),
+            "status": "sold" if sold[i] else "holding",
+            "sell_price": float(price[i] * rng.uniform(0.8, 1.3)) if sold[i] else 0.0,
+            "sell_date": days[buy[i] + hold[i]].strftime("%Y-%m-%d") if sold[i] else "",
+        })
+    return trades
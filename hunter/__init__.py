@@ -0,0 +1 @@
+# SOXL Hunter 공용 로직 (Streamlit 없이 import 가능)
@@ -0,0 +1,237 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+from hunter import data_cache, indicators, signals
+
+# -----------------------------------------------------------------------------
+# 이벤트 기반 신호 알림
+# - 새 봉(캐시 파일 변경 / 인트라데이 봉)이 들어왔을 때만 깨어나 증분 지표로 마지막 봉만 평가
+# - 등급 조건 ON/OFF 전환, 보유 로트 트레일링 스탑 이탈을 알림 레코드로 만들고
+#   (종류, 대상, 봉 날짜, 상태) 해시로 중복 제거 → 재시작해도 같은 알림을 다시 보내지 않음
+# - 알림은 교체 가능한 로컬 싱크로 전달: 파일 outbox(JSON lines) / 로컬 SMTP / 표준 출력
+#   python -m hunter.alerts --sink file:alerts_outbox.jsonl --sink smtp:localhost:1025
+# - 대기 중에는 파일 상태(stat)만 확인하고 잠들어 CPU 사용을 제한
+# -----------------------------------------------------------------------------
+STATE_FILE = os.environ.get("HUNTER_ALERT_STATE", "hunter_alerts_state.json")
+OUTBOX_FILE = "alerts_outbox.jsonl"
+POLL_SECONDS = 30
+FETCH_SECONDS = 300
+SENT_MEMORY = 2000
+
+
+# --- 싱크 ---
+class FileSink:
+    def __init__(self, path=OUTBOX_FILE):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+
+class SMTPSink:
+    # 로컬 SMTP (예: python -m aiosmtpd -n -l localhost:1025) 로 전달
+    def __init__(self, host="localhost", port=1025, sender="hunter@localhost", to="hunter@localhost"):
+        self.host, self.port, self.sender, self.to = host, int(port), sender, to
+
+    def send(self, alert):
+        import smtplib
+        from email.message import EmailMessage
+
+        msg = EmailMessage()
+        msg["Subject"] = f"[Hunter] {alert['message']}"
+        msg["From"], msg["To"] = self.sender, self.to
+        msg.set_content(json.dumps(alert, ensure_ascii=False, indent=2))
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(msg)
+
+
+class StdoutSink:
+    def send(self, alert):
+        print(json.dumps(alert, ensure_ascii=False), flush=True)
+
+
+SINKS = {"file": FileSink, "smtp": SMTPSink, "stdout": StdoutSink}
+
+
+def make_sink(spec):
+    # "file:경로" / "smtp:호스트:포트" / "stdout"
+    name, _, args = spec.partition(":")
+    return SINKS[name](*[a for a in args.split(":") if a])
+
+
+# --- 평가기 ---
+class AlertEvaluator:
+    def __init__(self, ticker="SOXL", sinks=None, rules=None, state_path=STATE_FILE, db_path=None):
+        self.ticker = ticker
+        self.sinks = sinks or [FileSink()]
+        self.rules = rules
+        self.state_path = state_path
+        self.db_path = db_path
+        self.engine = indicators.IncrementalIndicators()
+        self.state = {"bar": None, "tiers": {}, "breached": [], "sent": []}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    self.state.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+        self.sent = deque(self.state["sent"], maxlen=SENT_MEMORY)
+        self.sent_set = set(self.sent)
+
+    def _save(self):
+        self.state["sent"] = list(self.sent)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+
+    def _emit(self, kind, target, bar, status, message, **extra):
+        alert_id = hashlib.sha1(f"{self.ticker}|{kind}|{target}|{bar}|{status}".encode()).hexdigest()[:16]
+        if alert_id in self.sent_set:
+            return None
+        alert = {"id": alert_id, "created_at": datetime.now().isoformat(timespec="seconds"), "ticker": self.ticker,
+                 "kind": kind, "target": target, "bar": bar, "status": status, "message": message, **extra}
+        for sink in self.sinks:
+            try:
+                sink.send(alert)
+            except Exception as e:
+                print(f"알림 전송 실패 ({type(sink).__name__}): {e}", file=sys.stderr)
+        if len(self.sent) == self.sent.maxlen:
+            self.sent_set.discard(self.sent[0])
+        self.sent.append(alert_id)
+        self.sent_set.add(alert_id)
+        return alert
+
+    def on_bars(self, raw):
+        # raw: 전체 OHLCV (증분 엔진이 새로 붙은 봉만 계산), 마지막 봉 기준으로 상태 비교
+        if raw is None or len(raw) < data_cache.MIN_ROWS:
+            return []
+        bar = raw.index[-1].isoformat()
+        close = float(raw['Close'].iloc[-1])
+        if self.state["bar"] == [bar, close]:
+            return []  # 같은 봉, 같은 가격이면 평가할 것이 없음
+
+        ind = self.engine.extend(raw)
+        masks = signals.tier_masks(ind.iloc[-1:], self.rules)
+        alerts = []
+        for tier in signals.TIERS:
+            on = bool(masks[tier].iloc[0])
+            if on != self.state["tiers"].get(tier, False):
+                label = signals.TIER_LABELS[tier]
+                alerts.append(self._emit("tier", tier, bar[:10], "ON" if on else "OFF",
+                                         f"{self.ticker} {label} 신호 {'발생' if on else '해제'} (종가 ${close:.2f})", close=close))
+            self.state["tiers"][tier] = on
+        alerts += self._check_stops(raw, bar, close)
+
+        self.state["bar"] = [bar, close]
+        self._save()
+        return [a for a in alerts if a]
+
+    def _check_stops(self, raw, bar, close):
+        if self.ticker != "SOXL" or not self.db_path or not os.path.exists(self.db_path):
+            return []
+        from hunter import ledger, stops
+
+        holdings = ledger.load_holdings(self.db_path)
+        if not holdings:
+            self.state["breached"] = []
+            return []
+        _, stop_arr = stops.stop_levels(
+            stops.PeakIndex(raw.index, raw['Close']),
+            [t['date'] for t in holdings], [t['tier'] for t in holdings], [t['price'] for t in holdings], close,
+        )
+        breached = {t['id']: float(s) for t, s in zip(holdings, stop_arr) if close <= s}
+        alerts = []
+        for t in holdings:
+            if t['id'] in breached and t['id'] not in self.state["breached"]:
+                alerts.append(self._emit("stop", t['id'], bar[:10], "BREACH",
+                                         f"{t['tier']} {t['date']} 매수분 트레일링 스탑 이탈 (종가 ${close:.2f} ≤ 스탑 ${breached[t['id']]:.2f})",
+                                         stop=breached[t['id']], close=close, qty=t['qty']))
+        self.state["breached"] = sorted(breached)
+        return alerts
+
+    def on_intraday(self, session, seen=0):
+        # IntradaySession 의 등급 전환(flip) 중 아직 보내지 않은 것만 알림
+        alerts = []
+        for flip in session.flips[seen:]:
+            ts = flip["시각"].isoformat()
+            tier = next(t for t, label in signals.TIER_LABELS.items() if label == flip["등급"])
+            alerts.append(self._emit("intraday", tier, ts, flip["상태"],
+                                     f"{self.ticker} {flip['등급']} 인트라데이 {flip['상태']} ({ts[11:16]}, ${flip['종가']:.2f})", close=flip["종가"]))
+        if alerts:
+            self._save()
+        return [a for a in alerts if a], len(session.flips)
+
+
+# --- 실행 루프 ---
+def _cache_stamp(ticker):
+    try:
+        st = os.stat(data_cache.cache_path(ticker))
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def run(evaluator, years=3, offline=False, once=False, poll=POLL_SECONDS, fetch_every=FETCH_SECONDS):
+    # 캐시 파일이 바뀌었을 때만 평가 (앱의 백그라운드 갱신이 써도 감지), 온라인이면 fetch_every 마다 직접 갱신
+    stamp, last_fetch = None, 0.0
+    while True:
+        if not offline and time.monotonic() - last_fetch >= fetch_every:
+            data_cache.load_history(evaluator.ticker, years=years)
+            last_fetch = time.monotonic()
+        new_stamp = _cache_stamp(evaluator.ticker)
+        if new_stamp != stamp:
+            stamp = new_stamp
+            evaluator.on_bars(data_cache.load_cached(evaluator.ticker))
+        if once:
+            return
+        time.sleep(poll)
+
+
+def run_intraday(evaluator, source, poll=5.0):
+    from hunter import intraday
+
+    session, seen = intraday.IntradaySession(evaluator.rules), 0
+    while not source.done:
+        if session.feed(source.poll(), warmup=source.warmup):
+            _, seen = evaluator.on_intraday(session, seen)
+        else:
+            time.sleep(poll)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="새 봉이 들어올 때만 신호를 평가해 알림 outbox 에 기록")
+    parser.add_argument("--ticker", default="SOXL")
+    parser.add_argument("--sink", action="append", help="file:경로 / smtp:호스트:포트 / stdout (여러 번 지정 가능)")
+    parser.add_argument("--offline", action="store_true", help="다운로드 없이 캐시 파일 변경만 감시")
+    parser.add_argument("--once", action="store_true", help="한 번만 평가하고 종료 (cron 용)")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS)
+    parser.add_argument("--ledger", default=os.environ.get("HUNTER_DB", "hunter_ledger.db"))
+    parser.add_argument("--state", default=STATE_FILE)
+    parser.add_argument("--replay", default=None, help="녹화된 인트라데이 봉 파일을 재생하며 알림")
+    parser.add_argument("--speed", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    sinks = [make_sink(s) for s in args.sink or ["file:" + OUTBOX_FILE]]
+    evaluator = AlertEvaluator(args.ticker.upper(), sinks, state_path=args.state, db_path=args.ledger)
+    try:
+        if args.replay:
+            from hunter import intraday
+
+            run_intraday(evaluator, intraday.ReplaySource(intraday.load_bars(args.replay), speed=args.speed), poll=0.5)
+        else:
+            run(evaluator, offline=args.offline, once=args.once, poll=args.poll)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
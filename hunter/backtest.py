@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from hunter import signals
+
+# -----------------------------------------------------------------------------
+# 벡터화 백테스트
+# - 모든 봉 × 모든 보유기간의 선행 수익률 행렬을 한 번에 계산
+# - 신호별 보유기간 내 최대 유리/불리 변동폭 (MFE / MAE)
+# - 등급별 승률/평균/중앙값은 groupby 로 집계
+# -----------------------------------------------------------------------------
+DEFAULT_HORIZONS = (5, 15)
+WARMUP_BARS = 200  # MA200 이 채워지기 전 구간은 제외
+
+
+def return_col(h):
+    return f"수익률({h}일)"
+
+
+def forward_returns(close, horizons=DEFAULT_HORIZONS):
+    # (봉 수 × 보유기간 수) 행렬, 단위 %. 기간이 데이터 끝을 넘으면 NaN
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    out = np.full((n, len(horizons)), np.nan)
+    for j, h in enumerate(horizons):
+        if h < n:
+            out[:n - h, j] = (close[h:] - close[:n - h]) / close[:n - h] * 100
+    return out
+
+
+def excursions(close, horizon):
+    # 진입 다음 봉부터 horizon 봉 안의 최고/최저 종가 기준 MFE / MAE (%)
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    mfe = np.full(n, np.nan)
+    mae = np.full(n, np.nan)
+    if horizon < n:
+        windows = sliding_window_view(close[1:], horizon)  # i 번째 창 = close[i+1 : i+1+horizon]
+        base = close[:len(windows)]
+        mfe[:len(windows)] = (windows.max(axis=1) - base) / base * 100
+        mae[:len(windows)] = (windows.min(axis=1) - base) / base * 100
+    return mfe, mae
+
+
+def signal_table(df, horizons=DEFAULT_HORIZONS, masks=None, warmup=WARMUP_BARS):
+    horizons = sorted(set(int(h) for h in horizons))
+    if masks is None:
+        masks = signals.tier_masks(df)
+    codes = signals.tier_codes(masks)
+
+    n = len(df)
+    idx = np.flatnonzero(codes >= 0)
+    idx = idx[(idx >= warmup) & (idx < n - 1)]
+
+    close = df['Close'].to_numpy(dtype=float)
+    fwd = forward_returns(close, horizons)
+    mfe, mae = excursions(close, max(horizons))
+    labels = np.array([signals.TIER_LABELS[t] for t in signals.TIERS], dtype=object)
+
+    table = pd.DataFrame({
+        "날짜": df.index[idx].strftime('%Y-%m-%d'),
+        "등급": labels[codes[idx]],
+        "매수가": close[idx],
+    })
+    for j, h in enumerate(horizons):
+        table[return_col(h)] = fwd[idx, j]
+    table["MFE(%)"] = mfe[idx]
+    table["MAE(%)"] = mae[idx]
+    return table.sort_values("날짜", ascending=False, ignore_index=True)
+
+
+def win_rate(table, h):
+    valid = table[return_col(h)].dropna()
+    return (valid > 0).mean() * 100 if len(valid) > 0 else 0
+
+
+def tier_summary(table, horizons=DEFAULT_HORIZONS):
+    # 등급별 신호 수, 보유기간별 승률/평균/중앙값, 평균 MFE/MAE
+    horizons = sorted(set(int(h) for h in horizons))
+    cols = [return_col(h) for h in horizons]
+    g = table.groupby("등급", sort=False)
+
+    wins = table[cols].gt(0).astype(float).where(table[cols].notna())
+    win_g = wins.groupby(table["등급"], sort=False).mean() * 100
+    mean_g = g[cols].mean()
+    median_g = g[cols].median()
+
+    parts = {"신호 수": g.size()}
+    for h, c in zip(horizons, cols):
+        parts[f"승률({h}일)"] = win_g[c]
+        parts[f"평균({h}일)"] = mean_g[c]
+        parts[f"중앙값({h}일)"] = median_g[c]
+    parts["평균 MFE(%)"] = g["MFE(%)"].mean()
+    parts["평균 MAE(%)"] = g["MAE(%)"].mean()
+    summary = pd.DataFrame(parts)
+
+    order = [signals.TIER_LABELS[t] for t in signals.TIERS]
+    return summary.reindex([o for o in order if o in summary.index])
+
+
+def report(df, horizons=DEFAULT_HORIZONS, masks=None):
+    # 백테스트 페이지 출력 묶음 (신호 표 / 등급별 요약 / CSV 바이트) - 결과 캐시 단위
+    # masks: 멀티 타임프레임 확인 등으로 걸러낸 등급 조건 (없으면 기본 규칙)
+    table = signal_table(df, horizons, masks)
+    return {
+        "table": table,
+        "summary": tier_summary(table, horizons) if len(table) else None,
+        "csv": table.to_csv(index=False).encode('utf-8-sig'),
+    }
@@ -0,0 +1,114 @@
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import datetime
+
+from hunter import data_cache, registry, signals
+
+# -----------------------------------------------------------------------------
+# 헤드리스 신호 평가 (cron 등에서 Streamlit 없이 사용)
+#   python -m hunter.cli SOXL TQQQ --offline          # 캐시만 사용, 네트워크/yfinance 미로딩
+#   python -m hunter.cli SOXL --output status.json    # 파일로 저장
+# 오늘의 등급 조건, 지표 값, 등급별 진입 시 손절가, (SOXL) 장부 보유 로트의 스탑을 JSON 으로 출력
+# yfinance 는 실제로 내려받을 때만, 장부/스탑 모듈은 보유 로트를 볼 때만 import
+# -----------------------------------------------------------------------------
+STATUS_COLUMNS = ["Close", "Return", "Sigma", "Sigma60", "RSI", "RSI5", "RSI2", "Vol_Ratio", "Pct_B", "MA120", "MA200"]
+LEDGER_TICKER = "SOXL"
+
+
+def _num(value):
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
+def holding_stops(df, db_path):
+    # 장부가 없으면 새로 만들지 않고 건너뜀
+    if not db_path or not os.path.exists(db_path):
+        return []
+    from hunter import ledger, stops
+
+    holdings = ledger.load_holdings(db_path)
+    if not holdings:
+        return []
+    current = float(df['Close'].iloc[-1])
+    peaks, stop_arr = stops.stop_levels(
+        stops.PeakIndex(df.index, df['Close']),
+        [t['date'] for t in holdings], [t['tier'] for t in holdings], [t['price'] for t in holdings],
+        current,
+    )
+    return [
+        {
+            "id": t['id'], "date": t['date'], "tier": t['tier'], "price": t['price'], "qty": t['qty'],
+            "peak": _num(peak), "stop": _num(stop), "breached": bool(current <= stop),
+        }
+        for t, peak, stop in zip(holdings, peaks, stop_arr)
+    ]
+
+
+def evaluate(ticker, years=3, offline=False, db_path=None):
+    raw = data_cache.load_history(ticker, years=years, offline=offline)
+    if raw is None or len(raw) < data_cache.MIN_ROWS:
+        return None
+    # 마지막 봉에 필요한 열만, 필요한 lookback 구간만 계산
+    names = list(dict.fromkeys(STATUS_COLUMNS + signals.MASK_COLUMNS))
+    last = registry.compute(raw, names, tail=1)
+    today = last.iloc[-1]
+    masks = signals.tier_masks(last)
+    active = {t: bool(masks[t].iloc[0]) for t in signals.TIERS}
+    first = next((t for t in signals.TIERS if active[t]), None)
+    close = float(today['Close'])
+
+    result = {
+        "ticker": ticker,
+        "date": last.index[-1].strftime("%Y-%m-%d"),
+        "bars": len(raw),
+        "tiers": active,
+        "signal": signals.TIER_LABELS[first] if first else None,
+        "indicators": {c: _num(today[c]) for c in STATUS_COLUMNS},
+        "entry_stops": {t: _num(signals.stop_price(t, close, close)) for t in signals.TIERS},
+    }
+    if ticker == LEDGER_TICKER:
+        result["holdings"] = holding_stops(raw, db_path)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오늘의 다이아/골드/실버/블리츠 신호와 손절가를 JSON 으로 출력")
+    parser.add_argument("tickers", nargs="*", default=[LEDGER_TICKER])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--offline", action="store_true", help="로컬 캐시만 사용 (다운로드 안 함)")
+    parser.add_argument("--ledger", default=None, help="보유 로트 스탑 계산용 장부 DB (기본: HUNTER_DB)")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    db_path = args.ledger or os.environ.get("HUNTER_DB", "hunter_ledger.db")
+    results, missing = [], []
+    for ticker in dict.fromkeys(t.upper() for t in args.tickers):
+        try:
+            res = evaluate(ticker, args.years, args.offline, db_path)
+        except Exception as e:
+            res = None
+            print(f"{ticker}: {e}", file=sys.stderr)
+        if res is None:
+            missing.append(ticker)
+        else:
+            results.append(res)
+
+    payload = json.dumps(
+        {"generated_at": datetime.now().isoformat(timespec="seconds"), "results": results, "missing": missing},
+        ensure_ascii=False, indent=2,
+    )
+    if args.output:
+        tmp = args.output + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, args.output)
+    else:
+        print(payload)
+    return 2 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
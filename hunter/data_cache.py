@@ -0,0 +1,239 @@
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 로컬 OHLCV 캐시 (티커당 Parquet 파일 1개)
+# - 캐시를 먼저 읽고, 마지막 캐시 날짜 이후 봉만 추가로 받아 병합
+# - 아직 완성되지 않은 마지막 봉은 매번 다시 받아 덮어씀
+# - 데이터 소스 연결 실패 시 캐시만으로 동작
+# - 더 긴 기간을 한 번 받으면 디스크에는 그대로 두고, 반환은 요청한 기간(years)만큼만 잘라서
+# -----------------------------------------------------------------------------
+CACHE_DIR = os.environ.get("HUNTER_CACHE_DIR", "data_cache")
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+MIN_ROWS = 20
+
+# 겹치는 확정 봉의 종가가 이 비율 이상 다르면 (분할/배당 수정주가 변경) 전체 재수신
+ADJUST_TOLERANCE = 1e-4
+
+
+class FetchError(RuntimeError):
+    pass
+
+
+def cache_path(ticker):
+    return os.path.join(CACHE_DIR, f"{ticker.upper()}.parquet")
+
+
+def load_cached(ticker):
+    path = cache_path(ticker)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def save_cached(ticker, df):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = cache_path(ticker)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def normalize_ohlcv(df):
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df = df[[c for c in OHLCV_COLUMNS if c in df.columns]].copy()
+
+    # yf.Ticker.history 는 tz-aware, yf.download 는 tz-naive 인덱스를 주므로 날짜로 통일
+    idx = pd.DatetimeIndex(df.index)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    df.index = idx.normalize()
+    df.index.name = "Date"
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df.astype({c: "float64" for c in df.columns})
+
+
+def download_ohlcv(ticker, years=None, start=None, attempts=3):
+    import yfinance as yf
+
+    kwargs = {"start": start.strftime("%Y-%m-%d")} if start is not None else {"period": f"{years}y"}
+    for _ in range(attempts):
+        try:
+            df = yf.Ticker(ticker).history(interval="1d", **kwargs)
+            if df.empty:
+                time.sleep(1)
+                df = yf.download(ticker, interval="1d", progress=False, **kwargs)
+            if not df.empty:
+                return normalize_ohlcv(df)
+        except Exception:
+            pass
+        time.sleep(1)
+    return None
+
+
+def merge_tail(cached, fresh):
+    # fresh 가 덮는 구간(마지막 봉 포함)은 fresh 값으로 교체
+    head = cached[cached.index < fresh.index[0]]
+    return pd.concat([head, fresh])
+
+
+def _adjustments_changed(cached, fresh):
+    overlap = cached.index.intersection(fresh.index)
+    if len(overlap) == 0:
+        return True
+    # 마지막 캐시 봉은 미완성일 수 있으므로 확정 봉만 비교
+    overlap = overlap[overlap < cached.index[-1]]
+    if len(overlap) == 0:
+        return False
+    old = cached.loc[overlap, "Close"]
+    new = fresh.loc[overlap, "Close"]
+    return bool(((new - old).abs() > ADJUST_TOLERANCE * old.abs()).any())
+
+
+def download_panel(tickers, years=None, start=None):
+    # 여러 티커를 한 번의 배치 요청으로 수신 → {티커: OHLCV DataFrame}
+    import yfinance as yf
+
+    kwargs = {"start": start.strftime("%Y-%m-%d")} if start is not None else {"period": f"{years}y"}
+    try:
+        raw = yf.download(list(tickers), interval="1d", progress=False, group_by="ticker", threads=True, **kwargs)
+    except Exception:
+        return {}
+    if raw is None or raw.empty:
+        return {}
+
+    frames = {}
+    multi = isinstance(raw.columns, pd.MultiIndex)
+    for ticker in tickers:
+        if multi:
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            sub = raw[ticker]
+        elif len(tickers) == 1:
+            sub = raw
+        else:
+            continue
+        sub = sub.dropna(how="all")
+        if not sub.empty:
+            frames[ticker] = normalize_ohlcv(sub)
+    return frames
+
+
+def _needs_full(cached, years):
+    # 요청 기간이 캐시보다 길어진 경우 (예: 3년 → 30년) 에도 전체 재수신
+    return cached is None or len(cached) < MIN_ROWS or cached.attrs.get("years", 0) < years
+
+
+def _tail_start(cached):
+    # 마지막 확정 봉 하나를 겹쳐 받아 수정주가 변경 여부를 확인
+    return cached.index[-2] if len(cached) >= 2 else cached.index[-1]
+
+
+def _store_tail(ticker, cached, fresh, years):
+    merged = merge_tail(cached, fresh)
+    merged.attrs["years"] = cached.attrs.get("years", years)
+    save_cached(ticker, merged)
+    return merged
+
+
+def _disk_years(cached, years):
+    # 디스크에는 지금까지 요청된 가장 긴 기간을 유지 (수정주가 변경으로 전체 재수신할 때도 줄이지 않음)
+    return max(years, cached.attrs.get("years", 0)) if cached is not None else years
+
+
+def trim_years(df, years):
+    # 반환은 요청 기간만 (긴 히스토리는 디스크에만), 기준은 마지막 봉
+    if df is None or len(df) == 0:
+        return df
+    return df.loc[df.index >= df.index[-1] - pd.DateOffset(years=years)]
+
+
+def _store_full(ticker, full, years):
+    full.attrs["years"] = years
+    save_cached(ticker, full)
+    return full
+
+
+def _fetch_failed(ticker, cached, years, strict):
+    # strict: 다운로드 실패를 호출자에게 알림 (디스크 캐시를 새 데이터로 착각하지 않도록)
+    if strict:
+        raise FetchError(f"{ticker} 시세 다운로드 실패")
+    return trim_years(cached, years)
+
+
+def load_history(ticker="SOXL", years=3, offline=False, strict=False):
+    cached = load_cached(ticker)
+    if offline:
+        return trim_years(cached, years)
+
+    if not _needs_full(cached, years):
+        fresh = download_ohlcv(ticker, start=_tail_start(cached))
+        if fresh is None or fresh.empty:
+            return _fetch_failed(ticker, cached, years, strict)
+        if not _adjustments_changed(cached, fresh):
+            return trim_years(_store_tail(ticker, cached, fresh, years), years)
+
+    span = _disk_years(cached, years)
+    full = download_ohlcv(ticker, years=span)
+    if full is None or len(full) < MIN_ROWS:
+        return _fetch_failed(ticker, cached, years, strict)
+    return trim_years(_store_full(ticker, full, span), years)
+
+
+def cached_at(ticker):
+    # 디스크 캐시 파일이 마지막으로 쓰인 시각 (없으면 None)
+    try:
+        return datetime.fromtimestamp(os.path.getmtime(cache_path(ticker)))
+    except OSError:
+        return None
+
+
+def load_panel(tickers, years=3, offline=False):
+    # 캐시가 있는 티커는 꼬리 구간만, 없는 티커는 전체 기간을 각각 한 번의 배치로 수신
+    tickers = [t.upper() for t in tickers]
+    cached = {t: load_cached(t) for t in tickers}
+    if offline:
+        return {t: trim_years(f, years) for t, f in cached.items() if f is not None}
+
+    result = {}
+    full_needed = [t for t in tickers if _needs_full(cached[t], years)]
+    tail_tickers = [t for t in tickers if t not in full_needed]
+
+    if tail_tickers:
+        start = min(_tail_start(cached[t]) for t in tail_tickers)
+        fresh = download_panel(tail_tickers, start=start)
+        for t in tail_tickers:
+            f = fresh.get(t)
+            if f is None or f.empty:
+                result[t] = cached[t]
+            elif _adjustments_changed(cached[t], f):
+                full_needed.append(t)
+            else:
+                result[t] = _store_tail(t, cached[t], f, years)
+
+    if full_needed:
+        span = max(_disk_years(cached[t], years) for t in full_needed)
+        fresh = download_panel(full_needed, years=span)
+        for t in full_needed:
+            f = fresh.get(t)
+            if f is not None and len(f) >= MIN_ROWS:
+                result[t] = _store_full(t, f, span)
+            elif cached[t] is not None:
+                result[t] = cached[t]
+
+    return {t: trim_years(result[t], years) for t in tickers if t in result}
+
+
+def to_panel(frames, fields=OHLCV_COLUMNS):
+    # {티커: OHLCV} → {필드: 날짜 × 티커 DataFrame} (날짜는 합집합, 없는 칸은 NaN)
+    return {
+        field: pd.concat({t: f[field] for t, f in frames.items()}, axis=1).sort_index()
+        for field in fields
+    }
@@ -0,0 +1,138 @@
+import hashlib
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from hunter import ledger
+
+# -----------------------------------------------------------------------------
+# 장부 기반 일별 평가 자산 (mark-to-market)
+# - 매수/매도를 날짜별 증감(예수금, 보유 수량, 보유 원가, 실현 손익)으로 바꿔
+#   bincount + cumsum 으로 한 번에 누적 (날짜 루프 없음)
+# - 입금 내역은 장부에 없으므로 예수금은 현재 잔고에서 거꾸로 맞춤
+#   (첫날 예수금 = 현재 잔고 - 전체 매매 현금흐름)
+# - 결과는 장부 내용 + 가격 해시로 캐시하고, 새 봉/새 거래가 생기면
+#   처음 달라진 날부터 꼬리만 다시 누적
+# -----------------------------------------------------------------------------
+CURVE_COLUMNS = ["Hunter 예수금", "Blitz 예수금", "보유 수량", "보유 평가액", "총 자산", "실현 손익", "미실현 손익", "낙폭(%)"]
+_DELTAS = ["flow_h", "flow_b", "shares", "cost", "realized"]
+
+_lock = threading.Lock()
+_last = {}
+
+
+def ledger_events(trades):
+    # 거래 1건 → 매수 이벤트 1개 (+ 매도 완료면 매도 이벤트 1개)
+    rows = []
+    for t in trades:
+        blitz = ledger.wallet_key(ledger.tier_wallet(t["tier"])) == "blitz_cash"
+        cost = float(t["price"]) * int(t["qty"])
+        rows.append((t["date"], -cost * (not blitz), -cost * blitz, int(t["qty"]), cost, 0.0))
+        if t["status"] == "sold" and t.get("sell_date"):
+            proceeds = float(t["sell_price"]) * int(t["qty"])
+            rows.append((t["sell_date"], proceeds * (not blitz), proceeds * blitz, -int(t["qty"]), -cost, proceeds - cost))
+    events = pd.DataFrame(rows, columns=["date"] + _DELTAS)
+    events["date"] = pd.to_datetime(events["date"], errors="coerce")
+    return events.dropna(subset=["date"]).sort_values("date", kind="stable", ignore_index=True)
+
+
+def _digest(*parts):
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else repr(p).encode())
+    return h.hexdigest()
+
+
+def _same_cash(a, b):
+    return all(math.isclose(x, y, rel_tol=0.0, abs_tol=0.005) for x, y in zip(a, b))
+
+
+def _accumulate(events, index, close, start, base, cash0):
+    # start 이후 구간만 누적 (base: start-1 행의 누적값, 없으면 0)
+    n = len(index)
+    pos = np.clip(index.searchsorted(events["date"].to_numpy(), side="left"), 0, n - 1)
+    keep = pos >= start
+    pos = pos[keep] - start
+    sums = {k: np.cumsum(np.bincount(pos, weights=events[k].to_numpy()[keep], minlength=n - start)) + base[k]
+            for k in _DELTAS}
+
+    close = close[start:]
+    value = sums["shares"] * close
+    cash_h = cash0[0] + sums["flow_h"]
+    cash_b = cash0[1] + sums["flow_b"]
+    equity = cash_h + cash_b + value
+    return sums, pd.DataFrame({
+        "Hunter 예수금": cash_h,
+        "Blitz 예수금": cash_b,
+        "보유 수량": sums["shares"],
+        "보유 평가액": value,
+        "총 자산": equity,
+        "실현 손익": sums["realized"],
+        "미실현 손익": value - sums["cost"],
+    }, index=index[start:])
+
+
+def _first_change(prev, events, index, close):
+    # 이전 결과와 처음 달라지는 위치 (가격 또는 이벤트)
+    old_index = prev["index"]
+    k = min(len(old_index), len(index))
+    same = (old_index[:k] == index[:k]) & (prev["close"][:k] == close[:k])
+    start = k if same.all() else int(np.argmin(same))
+    if len(index) != len(old_index):
+        start = min(start, len(old_index) - 1)  # 마지막 봉 뒤 날짜로 눌러 둔 이벤트가 새 봉으로 이동
+
+    old = set(map(tuple, prev["events"].itertuples(index=False)))
+    new = set(map(tuple, events.itertuples(index=False)))
+    changed = [e[0] for e in old ^ new]
+    if changed:
+        start = min(start, int(index.searchsorted(min(changed), side="left")))
+    return max(start, 0)
+
+
+def equity_curve(trades, wallet, index, close):
+    # trades: ledger.load_portfolio(), wallet: ledger.load_wallet(), index/close: 일봉 날짜와 종가
+    index = pd.DatetimeIndex(index)
+    close = np.asarray(close, dtype=float)
+    events = ledger_events(trades)
+    cash0 = (wallet["hunter_cash"] - events["flow_h"].sum(), wallet["blitz_cash"] - events["flow_b"].sum())
+    # cash0 는 잔고 - 부동소수 합이라 거래가 추가되면 마지막 자리가 흔들림 → 센트 단위로 비교
+    key = _digest(index.asi8.tobytes(), close.tobytes(), pd.util.hash_pandas_object(events, index=False).to_numpy().tobytes(),
+                  tuple(round(c, 2) for c in cash0))
+
+    with _lock:
+        prev = _last.get("entry")
+        if prev is not None and prev["key"] == key:
+            return prev["curve"]
+
+        start = 0
+        if prev is not None and _same_cash(prev["cash0"], cash0) and len(prev["index"]) > 0:
+            start = _first_change(prev, events, index, close)
+        if start > 0:
+            base = {k: prev["sums"][k][start - 1] for k in _DELTAS}
+            peak0 = prev["peak"][start - 1]
+        else:
+            base = {k: 0.0 for k in _DELTAS}
+            peak0 = -np.inf
+
+        sums, tail = _accumulate(events, index, close, start, base, cash0)
+        peak = np.maximum.accumulate(np.concatenate([[peak0], tail["총 자산"].to_numpy()]))[1:]
+        tail["낙폭(%)"] = (tail["총 자산"] / peak - 1) * 100
+
+        if start > 0:
+            curve = pd.concat([prev["curve"].iloc[:start], tail])
+            sums = {k: np.concatenate([prev["sums"][k][:start], sums[k]]) for k in _DELTAS}
+            peak = np.concatenate([prev["peak"][:start], peak])
+        else:
+            curve = tail
+
+        _last["entry"] = {"key": key, "index": index, "close": close, "events": events, "cash0": cash0,
+                          "sums": sums, "peak": peak, "curve": curve, "recomputed": len(index) - start}
+        return curve
+
+
+def last_recomputed():
+    # 직전 호출에서 다시 누적한 행 수 (디버그용)
+    entry = _last.get("entry")
+    return entry["recomputed"] if entry else 0
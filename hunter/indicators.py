@@ -0,0 +1,366 @@
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 기술적 지표 계산
+# - add_indicators / panel_indicators: 전체 히스토리 벡터 계산 (기준 구현, 식은 hunter/registry.py)
+# - IndicatorEngine: 롤링 합/제곱합, Wilder 평균 상승/하락폭을 상태로 들고
+#   새 봉 하나당 O(1) 로 갱신 (스냅샷/복원 지원)
+# -----------------------------------------------------------------------------
+RSI_WINDOWS = {"RSI": 14, "RSI5": 5, "RSI2": 2}
+INDICATOR_COLUMNS = [
+    "MA20", "MA120", "MA200", "BB_Mid", "BB_Std", "BB_Lower", "Pct_B",
+    "RSI", "RSI5", "RSI2", "Return", "Sigma", "Sigma60", "VolMA20", "Vol_Ratio", "Is_Yangbong",
+]
+
+
+def calculate_rsi(data_delta, window):
+    # 1. 상승폭/하락폭 분리
+    gain = data_delta.where(data_delta > 0, 0)
+    loss = -data_delta.where(data_delta < 0, 0)
+
+    # 2. 지수이동평균(EWM) 적용 (alpha = 1/window)
+    avg_gain = gain.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1/window, min_periods=window, adjust=False).mean()
+
+    # 3. RS & RSI 계산
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+
+def indicator_columns(close, open_, volume):
+    # Series(단일 티커) / DataFrame(날짜 × 티커 패널) 모두 같은 식으로 계산
+    # 각 지표 식은 hunter/registry.py 에 한 번만 선언하고 여기서는 전체 구간을 평가
+    # (registry 가 이 모듈의 calculate_rsi 를 쓰므로 함수 안에서 import)
+    from hunter import registry
+
+    lazy = registry.LazyIndicators({"Close": close, "Open": open_, "Volume": volume})
+    return {col: lazy.get(col) for col in INDICATOR_COLUMNS}
+
+
+def add_indicators(df):
+    for col, values in indicator_columns(df['Close'], df['Open'], df['Volume']).items():
+        df[col] = values
+    return df
+
+
+def panel_indicators(panel):
+    # panel: {"Open"/"Close"/"Volume": 날짜 × 티커 DataFrame} → 지표도 같은 모양으로 추가
+    out = dict(panel)
+    out.update(indicator_columns(panel['Close'], panel['Open'], panel['Volume']))
+    return out
+
+
+def _div(a, b):
+    # pandas 의 float 나눗셈과 같은 결과 (0 나누기 → inf / nan)
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+class RollingWindow:
+    # 고정 길이 창의 평균/표본분산 (Welford 방식으로 추가·제거)
+    def __init__(self, size, values=()):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.mean = 0.0
+        self.m2 = 0.0
+        for v in values:
+            self.push(v)
+
+    def push(self, x):
+        n = len(self.values)
+        if n == self.size:
+            # 가장 오래된 값 제거 (deque 의 maxlen 이 실제로 밀어냄)
+            old = self.values[0]
+            if n == 1:
+                self.mean, self.m2 = 0.0, 0.0
+            else:
+                old_mean = self.mean
+                self.mean = (n * old_mean - old) / (n - 1)
+                self.m2 -= (old - old_mean) * (old - self.mean)
+            n -= 1
+        n += 1
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+        self.values.append(x)
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def avg(self):
+        return self.mean if self.full else math.nan
+
+    def std(self):
+        if not self.full or self.size < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.size - 1))
+
+
+class WilderAverage:
+    # RSI 용 평균 상승/하락폭 (ewm(alpha=1/window, adjust=False) 과 동일)
+    def __init__(self, window, avg_gain=0.0, avg_loss=0.0, count=0):
+        self.window = window
+        self.alpha = 1 / window
+        self.avg_gain = avg_gain
+        self.avg_loss = avg_loss
+        self.count = count
+
+    def push(self, delta):
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if self.count == 0:
+            self.avg_gain, self.avg_loss = gain, loss
+        else:
+            self.avg_gain = (1 - self.alpha) * self.avg_gain + self.alpha * gain
+            self.avg_loss = (1 - self.alpha) * self.avg_loss + self.alpha * loss
+        self.count += 1
+
+    def rsi(self):
+        if self.count < self.window:
+            return math.nan
+        rs = _div(self.avg_gain, self.avg_loss)
+        return 100 - (100 / (1 + rs))
+
+
+class IndicatorEngine:
+    def __init__(self):
+        self.prev_close = None
+        self.close20 = RollingWindow(20)
+        self.close120 = RollingWindow(120)
+        self.close200 = RollingWindow(200)
+        self.ret20 = RollingWindow(20)
+        self.ret60 = RollingWindow(60)
+        self.vol20 = RollingWindow(20)
+        self.rsi = {col: WilderAverage(w) for col, w in RSI_WINDOWS.items()}
+
+    def update(self, open_, close, volume):
+        for w in (self.close20, self.close120, self.close200):
+            w.push(close)
+        self.vol20.push(volume)
+
+        if self.prev_close is None:
+            # 첫 봉: diff 가 NaN 이면 gain/loss 는 0 으로 처리됨 (calculate_rsi 와 동일)
+            delta, ret = 0.0, math.nan
+        else:
+            delta = close - self.prev_close
+            ret = _div(close, self.prev_close) - 1
+            self.ret20.push(ret)
+            self.ret60.push(ret)
+        for avg in self.rsi.values():
+            avg.push(delta)
+        self.prev_close = close
+
+        ma20, std20 = self.close20.avg(), self.close20.std()
+        lower = ma20 - 2 * std20
+        denom = (ma20 + 2 * std20) - lower
+        pct_b = 0.0 if denom == 0 else _div(close - lower, denom)
+        vol_ma = self.vol20.avg()
+
+        row = {
+            "MA20": ma20,
+            "MA120": self.close120.avg(),
+            "MA200": self.close200.avg(),
+            "BB_Mid": ma20,
+            "BB_Std": std20,
+            "BB_Lower": lower,
+            "Pct_B": pct_b,
+            "Return": ret,
+            "Sigma": _div(ret - self.ret20.avg(), self.ret20.std()),
+            "Sigma60": _div(ret - self.ret60.avg(), self.ret60.std()),
+            "VolMA20": vol_ma,
+            "Vol_Ratio": _div(volume, vol_ma),
+            "Is_Yangbong": close > open_,
+        }
+        for col, avg in self.rsi.items():
+            row[col] = avg.rsi()
+        return row
+
+    def run(self, df):
+        rows = [self.update(o, c, v) for o, c, v in zip(df['Open'], df['Close'], df['Volume'])]
+        return pd.DataFrame(rows, index=df.index, columns=INDICATOR_COLUMNS)
+
+    # --- 스냅샷 / 복원 (JSON 직렬화 가능한 dict) ---
+    def snapshot(self):
+        return {
+            "prev_close": self.prev_close,
+            "close": list(self.close200.values),
+            "returns": list(self.ret60.values),
+            "volume": list(self.vol20.values),
+            "rsi": {col: [a.avg_gain, a.avg_loss, a.count] for col, a in self.rsi.items()},
+        }
+
+    @classmethod
+    def restore(cls, snap):
+        engine = cls()
+        engine.prev_close = snap["prev_close"]
+        closes, returns = snap["close"], snap["returns"]
+        engine.close20 = RollingWindow(20, closes[-20:])
+        engine.close120 = RollingWindow(120, closes[-120:])
+        engine.close200 = RollingWindow(200, closes)
+        engine.ret20 = RollingWindow(20, returns[-20:])
+        engine.ret60 = RollingWindow(60, returns)
+        engine.vol20 = RollingWindow(20, snap["volume"])
+        for col, (gain, loss, count) in snap["rsi"].items():
+            engine.rsi[col] = WilderAverage(RSI_WINDOWS[col], gain, loss, count)
+        return engine
+
+    @classmethod
+    def from_history(cls, df):
+        # 봉 단위 루프 없이 히스토리 끝의 상태를 벡터 계산으로 복원
+        if len(df) == 0:
+            return cls()
+        close = df['Close']
+        delta = close.diff().fillna(0.0)
+        rsi_state = {}
+        for col, window in RSI_WINDOWS.items():
+            gain = delta.clip(lower=0).ewm(alpha=1/window, adjust=False).mean().iloc[-1]
+            loss = (-delta).clip(lower=0).ewm(alpha=1/window, adjust=False).mean().iloc[-1]
+            rsi_state[col] = [float(gain), float(loss), len(df)]
+        returns = close.pct_change().iloc[1:]
+        return cls.restore({
+            "prev_close": float(close.iloc[-1]),
+            "close": close.iloc[-200:].tolist(),
+            "returns": returns.iloc[-60:].tolist(),
+            "volume": df['Volume'].iloc[-20:].tolist(),
+            "rsi": rsi_state,
+        })
+
+
+# -----------------------------------------------------------------------------
+# 티커별 증분 상태: 확정 봉까지의 엔진 스냅샷 + 미리 잡아 둔 열 버퍼
+# - 새 데이터가 마지막 확정 봉(날짜·종가)을 같은 위치 관계로 포함하면 그 뒤 봉만 엔진으로 계산해
+#   버퍼에 이어 씀 (봉당 O(1), 용량이 차면 두 배로 늘림)
+# - 앞쪽이 잘린 창(data_cache.trim_years 로 하루씩 밀림)도 시작 위치만 옮겨 그대로 이어감
+# - frame 은 버퍼 [head:n] 을 복사 없이 감싼 뷰: 확정 행은 바뀌지 않지만 마지막 행은
+#   다음 extend 에서 다시 쓰일 수 있으므로 보관하려면 복사할 것 (compute_incremental 참고)
+# -----------------------------------------------------------------------------
+class IncrementalIndicators:
+    def __init__(self):
+        self.columns = None
+        self.buffers = {}
+        self.stamps = None
+        self.index_name = None
+        self.tz = None
+        self.head = 0
+        self.n = 0
+        self.confirmed = None
+
+    @staticmethod
+    def _stamps(index):
+        # 시각은 UTC 기준 naive datetime64 로 저장 (tz 는 뷰를 만들 때 복원)
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        return index.to_numpy()
+
+    @property
+    def frame(self):
+        if self.columns is None:
+            return None
+        index = pd.DatetimeIndex(self.stamps[self.head:self.n], name=self.index_name)
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return pd.DataFrame({c: self.buffers[c][self.head:self.n] for c in self.columns}, index=index, copy=False)
+
+    def _locate(self, raw):
+        # raw 에서 이어 쓸 위치: (raw 첫 봉의 버퍼 위치, 마지막 확정 봉의 raw 위치) 또는 None
+        if self.columns is None or self.n - self.head < 2 or list(raw.columns) != self.columns[:len(raw.columns)]:
+            return None
+        stamps = self.stamps[self.head:self.n]
+        raw_first = self._stamps(raw.index[:1])[0]
+        first = int(stamps.searchsorted(raw_first))
+        last = len(stamps) - 2  # 마지막 확정 봉
+        if first > last or stamps[first] != raw_first:
+            return None  # 더 긴 과거를 요청했거나 확정 구간 밖에서 시작
+        pos = last - first
+        if (pos >= len(raw) - 1 or self._stamps(raw.index[pos:pos + 1])[0] != stamps[last]
+                or raw['Close'].iloc[pos] != self.buffers['Close'][self.head + last]):
+            return None  # 확정 봉이 빠졌거나 값이 달라짐 (수정주가 등) → 전체 재계산
+        return first, pos
+
+    def _reserve(self, size):
+        cap = len(self.stamps)
+        if self.head + size <= cap:
+            return
+        # 살아 있는 구간만 새 버퍼 앞쪽으로 옮기고 용량을 두 배로
+        live = self.n - self.head
+        cap = max(2 * cap, size * 2, 64)
+        stamps = np.empty(cap, dtype=self.stamps.dtype)
+        stamps[:live] = self.stamps[self.head:self.n]
+        for c, buf in self.buffers.items():
+            grown = np.empty(cap, dtype=buf.dtype)
+            grown[:live] = buf[self.head:self.n]
+            self.buffers[c] = grown
+        self.stamps, self.head, self.n = stamps, 0, live
+
+    def _rebuild(self, raw):
+        full = add_indicators(raw.copy())
+        cap = max(2 * len(full), 64)
+        self.columns = list(full.columns)
+        self.buffers = {}
+        for c in self.columns:
+            buf = np.empty(cap, dtype=full[c].to_numpy().dtype)
+            buf[:len(full)] = full[c].to_numpy()
+            self.buffers[c] = buf
+        self.stamps = np.empty(cap, dtype="datetime64[ns]")
+        self.stamps[:len(full)] = self._stamps(full.index)
+        self.index_name, self.tz = full.index.name, pd.DatetimeIndex(full.index).tz
+        self.head, self.n = 0, len(full)
+        self.confirmed = IndicatorEngine.from_history(raw.iloc[:-1]).snapshot()
+
+    def extend(self, raw):
+        loc = self._locate(raw)
+        if loc is None:
+            self._rebuild(raw)
+            return self._view(raw)
+
+        # 마지막(미완성일 수 있는) 봉부터 다시 계산해 버퍼에 덮어씀
+        first, pos = loc
+        self.head += first
+        tail = raw.iloc[pos + 1:]
+        start = self.n - 1 - self.head  # 마지막 봉의 상대 위치
+        self._reserve(start + len(tail))
+        at = self.head + start
+        engine = IndicatorEngine.restore(self.confirmed)
+        stamps = self._stamps(tail.index)
+        raw_cols = [c for c in tail.columns if c in self.buffers]
+        raw_values = {c: tail[c].to_numpy() for c in raw_cols}
+        for i, (o, c, v) in enumerate(zip(tail['Open'], tail['Close'], tail['Volume'])):
+            if i == len(tail) - 1:
+                self.confirmed = engine.snapshot()
+            row = engine.update(o, c, v)
+            self.stamps[at + i] = stamps[i]
+            for col in raw_cols:
+                self.buffers[col][at + i] = raw_values[col][i]
+            for col in INDICATOR_COLUMNS:
+                self.buffers[col][at + i] = row[col]
+        self.n = at + len(tail)
+        return self._view(raw)
+
+    def _view(self, raw):
+        view = self.frame
+        view.attrs.update(raw.attrs)
+        return view
+
+
+_STATES = {}
+_LOCK = threading.Lock()
+
+
+def compute_incremental(key, raw, finish=None):
+    # 백그라운드 갱신 스레드와 요청 스레드가 같은 상태를 동시에 건드리지 않도록 잠금
+    # finish: 잠금 안에서 버퍼 뷰를 보관용 프레임으로 바꾸는 함수 (기본은 복사, 예: shared_store.freeze)
+    with _LOCK:
+        state = _STATES.setdefault(key, IncrementalIndicators())
+        view = state.extend(raw)
+        return finish(view) if finish is not None else view.copy()
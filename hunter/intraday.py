@@ -0,0 +1,172 @@
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from hunter import data_cache, signals
+from hunter.indicators import IndicatorEngine
+
+# -----------------------------------------------------------------------------
+# 인트라데이(1분/5분봉) 스트리밍
+# - 봉 소스: Yahoo 실시간 폴링 / 녹화된 봉 파일 재생(ReplaySource)
+# - IntradaySession: 확정 봉 스냅샷 + 미완성 봉 갱신으로 지표를 O(1) 업데이트하고
+#   등급 조건이 켜지고 꺼지는 순간(flip)을 기록, 업데이트 지연/처리량 측정
+#   (실시간 소스의 첫 워밍업 묶음은 지표/등급 상태만 채우고 flip 으로 기록하지 않음)
+# -----------------------------------------------------------------------------
+INTERVALS = ["1m", "5m"]
+WARMUP_PERIOD = {"1m": "5d", "5m": "1mo"}
+
+
+def load_bars(path):
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    else:
+        df = pd.read_parquet(path)
+    return df[[c for c in data_cache.OHLCV_COLUMNS if c in df.columns]].sort_index()
+
+
+def save_bars(df, path):
+    if path.endswith(".csv"):
+        df.to_csv(path)
+    else:
+        df.to_parquet(path)
+
+
+class YahooIntradaySource:
+    # 첫 호출은 지표 워밍업용으로 며칠치, 이후에는 당일 봉(미완성 봉 포함)만 다시 받음
+    def __init__(self, ticker="SOXL", interval="1m"):
+        self.ticker = ticker
+        self.interval = interval
+        self.warm = False
+        self.warmup = False  # 직전 poll 결과가 워밍업 묶음인지
+
+    def poll(self):
+        import yfinance as yf
+
+        period = "1d" if self.warm else WARMUP_PERIOD.get(self.interval, "5d")
+        try:
+            df = yf.Ticker(self.ticker).history(period=period, interval=self.interval)
+        except Exception:
+            return None
+        if df is None or df.empty:
+            return None
+        self.warmup = not self.warm
+        self.warm = True
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        df = df[data_cache.OHLCV_COLUMNS]
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        return df
+
+    @property
+    def done(self):
+        return False
+
+
+class ReplaySource:
+    # 녹화된 봉을 speed 배속으로 흘려보냄 (speed=0 이면 한 번에 전부)
+    warmup = False  # 녹화 파일은 처음부터 전부 세션으로 재생
+
+    def __init__(self, bars, speed=60.0, clock=time.monotonic):
+        self.bars = bars
+        self.speed = speed
+        self.clock = clock
+        self.t0 = None
+        self.pos = 0
+
+    def poll(self):
+        if self.done:
+            return None
+        if self.speed <= 0:
+            end = len(self.bars)
+        else:
+            now = self.clock()
+            if self.t0 is None:
+                self.t0 = now
+            cutoff = self.bars.index[0] + pd.Timedelta(seconds=(now - self.t0) * self.speed)
+            end = max(self.pos + 1, self.bars.index.searchsorted(cutoff, side="right"))
+        out = self.bars.iloc[self.pos:end]
+        self.pos = end
+        return out
+
+    @property
+    def done(self):
+        return self.pos >= len(self.bars)
+
+
+class IntradaySession:
+    def __init__(self, rules=None, max_rows=2000, latency_window=5000):
+        self.rules = rules
+        self.engine = IndicatorEngine()
+        self.confirmed = self.engine.snapshot()
+        self.last_ts = None
+        self.rows = deque(maxlen=max_rows)
+        self.states = {t: False for t in signals.TIERS}
+        self.flips = []
+        self.latencies = deque(maxlen=latency_window)
+        self.n_updates = 0
+        self.busy = 0.0
+
+    def on_bar(self, ts, open_, high, low, close, volume, record=True):
+        t0 = time.perf_counter()
+        if self.last_ts is not None and ts < self.last_ts:
+            return None  # 이미 처리한 과거 봉
+        if ts == self.last_ts:
+            # 미완성 봉 갱신: 직전 확정 상태로 되돌린 뒤 다시 반영
+            self.engine = IndicatorEngine.restore(self.confirmed)
+            self.rows.pop()
+        else:
+            if self.last_ts is not None:
+                self.confirmed = self.engine.snapshot()
+            self.last_ts = ts
+
+        row = self.engine.update(open_, close, volume)
+        row.update({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume})
+        self.rows.append((ts, row))
+        self._check_flips(ts, row, record)
+
+        dt = time.perf_counter() - t0
+        self.latencies.append(dt)
+        self.busy += dt
+        self.n_updates += 1
+        return row
+
+    def _check_flips(self, ts, row, record=True):
+        with np.errstate(invalid="ignore"):
+            masks = signals.tier_masks({k: np.asarray(v) for k, v in row.items()}, self.rules)
+        for tier in signals.TIERS:
+            on = bool(masks[tier])
+            if on != self.states[tier]:
+                if record:
+                    self.flips.append({"시각": ts, "등급": signals.TIER_LABELS[tier], "상태": "ON" if on else "OFF", "종가": row["Close"]})
+                self.states[tier] = on
+
+    def feed(self, bars, warmup=False):
+        # warmup: 과거 구간 백필 → 상태만 맞추고 세션 중 전환으로 기록하지 않음
+        if bars is None or len(bars) == 0:
+            return 0
+        cols = [bars[c].to_numpy(dtype=float) for c in data_cache.OHLCV_COLUMNS]
+        for ts, o, h, l, c, v in zip(bars.index, *cols):
+            self.on_bar(ts, o, h, l, c, v, record=not warmup)
+        return len(bars)
+
+    def frame(self):
+        if not self.rows:
+            return pd.DataFrame()
+        index, rows = zip(*self.rows)
+        return pd.DataFrame(list(rows), index=pd.DatetimeIndex(index))
+
+    @property
+    def latest(self):
+        return self.rows[-1][1] if self.rows else None
+
+    def stats(self):
+        lat = np.array(self.latencies) * 1e6
+        return {
+            "업데이트 수": self.n_updates,
+            "지연 p50(µs)": float(np.percentile(lat, 50)) if len(lat) else np.nan,
+            "지연 p95(µs)": float(np.percentile(lat, 95)) if len(lat) else np.nan,
+            "처리량(봉/초)": self.n_updates / self.busy if self.busy > 0 else np.nan,
+        }
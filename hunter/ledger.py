@@ -0,0 +1,276 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 지갑 / 매매 장부 (SQLite, WAL 모드)
+# - 매수/매도는 지갑과 거래 행을 한 트랜잭션으로 함께 갱신
+# - BEGIN IMMEDIATE 로 쓰기 잠금을 먼저 잡아 여러 세션이 서로 덮어쓰지 않음
+# - 기존 my_wallet.json / my_portfolio.json 은 최초 1회 가져오기
+# -----------------------------------------------------------------------------
+DB_FILE = os.environ.get("HUNTER_DB", "hunter_ledger.db")
+DEFAULT_WALLET = {"hunter_cash": 700.0, "blitz_cash": 300.0}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallet (
+    key TEXT PRIMARY KEY,
+    amount REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trades (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    tier TEXT NOT NULL,
+    price REAL NOT NULL,
+    qty INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'holding',
+    sell_price REAL NOT NULL DEFAULT 0,
+    sell_date TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status);
+CREATE INDEX IF NOT EXISTS idx_trades_date ON trades(date);
+CREATE INDEX IF NOT EXISTS idx_trades_sell_date ON trades(sell_date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_local = threading.local()
+
+
+def connect(path=None):
+    # Streamlit 세션은 스레드가 다르므로 스레드별로 연결을 재사용
+    path = path or DB_FILE
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        conns[path] = conn
+    return conn
+
+
+@contextmanager
+def transaction(path=None):
+    conn = connect(path)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def wallet_key(strategy_type):
+    return "blitz_cash" if strategy_type in ["Blitz", "블리츠"] else "hunter_cash"
+
+
+def tier_wallet(tier):
+    return "Blitz" if "블리츠" in tier else "Hunter"
+
+
+# --- 최초 1회 JSON 가져오기 ---
+def import_json(wallet_file, portfolio_file, path=None):
+    # 매 rerun 마다 불려도 쓰기 잠금 없이 바로 반환되도록 먼저 읽기로 확인
+    if connect(path).execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+        return False
+    with transaction(path) as conn:
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+            return False
+
+        wallet = dict(DEFAULT_WALLET)
+        if os.path.exists(wallet_file):
+            try:
+                with open(wallet_file, "r") as f:
+                    wallet.update(json.load(f))
+            except Exception:
+                pass
+        conn.executemany(
+            "INSERT OR REPLACE INTO wallet (key, amount) VALUES (?, ?)",
+            [(k, float(wallet[k])) for k in DEFAULT_WALLET],
+        )
+
+        trades = []
+        if os.path.exists(portfolio_file):
+            try:
+                with open(portfolio_file, "r") as f:
+                    trades = json.load(f)
+            except Exception:
+                trades = []
+        conn.executemany(
+            "INSERT OR REPLACE INTO trades (id, date, tier, price, qty, status, sell_price, sell_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (t.get("id") or str(uuid.uuid4()), t["date"], t["tier"], float(t["price"]), int(t["qty"]),
+                 t.get("status", "holding"), float(t.get("sell_price") or 0.0), t.get("sell_date") or "")
+                for t in trades
+            ],
+        )
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', ?)", (datetime.now().isoformat(),))
+    return True
+
+
+# --- 지갑 ---
+def load_wallet(path=None):
+    rows = connect(path).execute("SELECT key, amount FROM wallet").fetchall()
+    wallet = dict(DEFAULT_WALLET)
+    wallet.update({r["key"]: r["amount"] for r in rows})
+    return wallet
+
+
+def _apply_cash(conn, key, amount, action):
+    if action == "set":
+        conn.execute("INSERT OR REPLACE INTO wallet (key, amount) VALUES (?, ?)", (key, float(amount)))
+        return
+    sign = -1 if action == "buy" else 1  # deposit / sell
+    conn.execute("INSERT OR IGNORE INTO wallet (key, amount) VALUES (?, ?)", (key, DEFAULT_WALLET[key]))
+    conn.execute("UPDATE wallet SET amount = amount + ? WHERE key = ?", (sign * float(amount), key))
+
+
+def update_cash(strategy_type, amount, action, path=None):
+    with transaction(path) as conn:
+        _apply_cash(conn, wallet_key(strategy_type), amount, action)
+    return load_wallet(path)
+
+
+# --- 매매 기록 ---
+def _rows(cursor):
+    return [dict(r) for r in cursor.fetchall()]
+
+
+def load_portfolio(path=None):
+    return _rows(connect(path).execute("SELECT * FROM trades ORDER BY date, rowid"))
+
+
+def load_holdings(path=None):
+    return _rows(connect(path).execute("SELECT * FROM trades WHERE status = 'holding' ORDER BY date, rowid"))
+
+
+def load_sold_frame(path=None):
+    # 매도 완료 건 전체를 DataFrame 으로 (idx_trades_status 사용)
+    return pd.read_sql_query(
+        "SELECT * FROM trades WHERE status = 'sold' ORDER BY sell_date DESC, rowid DESC", connect(path)
+    )
+
+
+def _insert_trade(conn, date, tier, price, qty):
+    trade_id = str(uuid.uuid4())
+    conn.execute(
+        "INSERT INTO trades (id, date, tier, price, qty, status, sell_price, sell_date) VALUES (?, ?, ?, ?, ?, 'holding', 0.0, '')",
+        (trade_id, date.strftime("%Y-%m-%d"), tier, float(price), int(qty)),
+    )
+    return trade_id
+
+
+def add_trade(date, tier, price, qty, path=None):
+    with transaction(path) as conn:
+        return _insert_trade(conn, date, tier, price, qty)
+
+
+def buy_trade(date, tier, price, qty, path=None):
+    # 잔고 확인 → 출금 → 거래 기록을 한 트랜잭션으로 (잔고 부족 시 아무것도 바꾸지 않음)
+    cost = float(price) * int(qty)
+    key = wallet_key(tier_wallet(tier))
+    with transaction(path) as conn:
+        row = conn.execute("SELECT amount FROM wallet WHERE key = ?", (key,)).fetchone()
+        balance = row["amount"] if row else DEFAULT_WALLET[key]
+        if balance < cost:
+            return None
+        _apply_cash(conn, key, cost, "buy")
+        return _insert_trade(conn, date, tier, price, qty)
+
+
+def delete_trade(trade_id, path=None):
+    with transaction(path) as conn:
+        conn.execute("DELETE FROM trades WHERE id = ?", (trade_id,))
+
+
+def sell_trade(trade_id, sell_price, path=None):
+    with transaction(path) as conn:
+        row = conn.execute("SELECT * FROM trades WHERE id = ? AND status = 'holding'", (trade_id,)).fetchone()
+        if row is None:
+            return False, 0, ""
+        conn.execute(
+            "UPDATE trades SET status = 'sold', sell_price = ?, sell_date = ? WHERE id = ?",
+            (float(sell_price), datetime.now().strftime("%Y-%m-%d"), trade_id),
+        )
+        total = float(sell_price) * row["qty"]
+        w_type = tier_wallet(row["tier"])
+        _apply_cash(conn, wallet_key(w_type), total, "sell")
+    return True, total, w_type
+
+
+def sell_trades(sales, path=None):
+    # 여러 로트 일괄 매도: {id: 매도가} → 한 트랜잭션에서 상태 변경 + 지갑별 입금 합산
+    if not sales:
+        return 0, {}
+    sell_date = datetime.now().strftime("%Y-%m-%d")
+    totals = {}
+    with transaction(path) as conn:
+        ids = list(sales)
+        marks = ", ".join("?" * len(ids))
+        rows = conn.execute(f"SELECT id, tier, qty FROM trades WHERE status = 'holding' AND id IN ({marks})", ids).fetchall()
+        conn.executemany(
+            "UPDATE trades SET status = 'sold', sell_price = ?, sell_date = ? WHERE id = ?",
+            [(float(sales[r["id"]]), sell_date, r["id"]) for r in rows],
+        )
+        for r in rows:
+            w_type = tier_wallet(r["tier"])
+            totals[w_type] = totals.get(w_type, 0.0) + float(sales[r["id"]]) * r["qty"]
+        for w_type, total in totals.items():
+            _apply_cash(conn, wallet_key(w_type), total, "sell")
+    return len(rows), totals
+
+
+def delete_trades(trade_ids, path=None):
+    with transaction(path) as conn:
+        conn.executemany("DELETE FROM trades WHERE id = ?", [(i,) for i in trade_ids])
+
+
+EDITABLE_FIELDS = {"date": str, "tier": str, "price": float, "qty": int, "sell_price": float, "sell_date": str}
+
+
+def _clean_fields(fields):
+    # data_editor 변경분 → DB 값 (날짜는 'YYYY-MM-DD' 문자열)
+    out = {}
+    for col, value in fields.items():
+        cast = EDITABLE_FIELDS.get(col)
+        if cast is None or value is None:
+            continue
+        out[col] = str(value)[:10] if col in ("date", "sell_date") else cast(value)
+    return out
+
+
+def apply_history_changes(updates, added, deleted_ids, path=None):
+    # 수정/추가/삭제된 매도 기록만 한 트랜잭션으로 반영
+    # updates: {id: {필드: 값}}, added: [{필드: 값}], deleted_ids: [id]
+    skipped = 0
+    with transaction(path) as conn:
+        conn.executemany("DELETE FROM trades WHERE id = ? AND status = 'sold'", [(i,) for i in deleted_ids])
+        for trade_id, fields in updates.items():
+            fields = _clean_fields(fields)
+            if not fields:
+                continue
+            assignments = ", ".join(f"{col} = ?" for col in fields)
+            conn.execute(f"UPDATE trades SET {assignments} WHERE id = ? AND status = 'sold'", (*fields.values(), trade_id))
+        for row in added:
+            fields = _clean_fields(row)
+            if set(fields) != set(EDITABLE_FIELDS):
+                skipped += 1
+                continue
+            conn.execute(
+                "INSERT INTO trades (id, date, tier, price, qty, status, sell_price, sell_date) VALUES (?, ?, ?, ?, ?, 'sold', ?, ?)",
+                (str(uuid.uuid4()), fields["date"], fields["tier"], fields["price"], fields["qty"], fields["sell_price"], fields["sell_date"]),
+            )
+    return skipped
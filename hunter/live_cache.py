@@ -0,0 +1,182 @@
+import sys
+import threading
+import time
+from datetime import datetime
+
+from hunter import data_cache, indicators, shared_store, synthetic
+
+# -----------------------------------------------------------------------------
+# Stale-while-revalidate 데이터 캐시 (프로세스 전체 공유)
+# - 마지막으로 성공한 프레임을 항상 즉시 반환하고, TTL 이 지나면 백그라운드에서 갱신
+# - 갱신 실패 시 지수 백오프, 그동안은 오래된 데이터를 그대로 제공
+#   (loader 는 실패 시 예외를 던져야 함 → 디스크 캐시를 새로 받은 데이터로 표시하지 않음)
+# - 메모리에 없으면 디스크 캐시로 즉시 응답(source="disk", 파일 저장 시각 기준 나이), 디스크에도 없을 때만 시간 예산 안에서 대기
+# - 반환 프레임은 여러 세션이 공유하므로 읽기 전용으로 사용
+# -----------------------------------------------------------------------------
+TTL = 300
+FETCH_BUDGET = 3.0
+BACKOFF_BASE = 5
+BACKOFF_MAX = 600
+
+
+class _Entry:
+    def __init__(self):
+        self.value = None
+        self.fetched_at = None
+        self.source = None
+        self.error = None
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.thread = None
+
+
+class SWRCache:
+    def __init__(self, loader, fallback=None, ttl=TTL, budget=FETCH_BUDGET, stamp=None):
+        # stamp(key): fallback 데이터가 만들어진 시각 (디스크 파일 mtime)
+        self.loader = loader
+        self.fallback = fallback
+        self.stamp = stamp
+        self.ttl = ttl
+        self.budget = budget
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def _entry(self, key):
+        with self.lock:
+            return self.entries.setdefault(key, _Entry())
+
+    def _run(self, key, entry):
+        try:
+            value = self.loader(key)
+            if value is None:
+                raise RuntimeError("데이터 없음")
+            with self.lock:
+                entry.value, entry.fetched_at, entry.source = value, datetime.now(), "live"
+                entry.error, entry.failures, entry.next_attempt = None, 0, 0.0
+        except Exception as e:
+            with self.lock:
+                entry.error = str(e) or type(e).__name__
+                entry.failures += 1
+                entry.next_attempt = time.monotonic() + min(BACKOFF_BASE * 2 ** (entry.failures - 1), BACKOFF_MAX)
+        finally:
+            with self.lock:
+                entry.thread = None
+
+    def refresh(self, key, wait=None, force=False):
+        entry = self._entry(key)
+        with self.lock:
+            thread = entry.thread
+            if thread is None and (force or time.monotonic() >= entry.next_attempt):
+                thread = entry.thread = threading.Thread(target=self._run, args=(key, entry), daemon=True)
+                thread.start()
+        if thread is not None and wait:
+            thread.join(wait)
+        return entry
+
+    def _is_stale(self, entry):
+        # 디스크에서 읽은 값은 나이와 관계없이 한 번은 실시간 갱신을 시도
+        return (entry.source != "live" or entry.fetched_at is None
+                or (datetime.now() - entry.fetched_at).total_seconds() > self.ttl)
+
+    def get(self, key):
+        entry = self._entry(key)
+        if entry.value is None and self.fallback is not None:
+            # 콜드 스타트: 디스크 캐시로 즉시 응답하고 최신화는 백그라운드로
+            value = self.fallback(key)
+            if value is not None:
+                fetched_at = self.stamp(key) if self.stamp else None
+                with self.lock:
+                    if entry.value is None:
+                        entry.value, entry.source, entry.fetched_at = value, "disk", fetched_at
+
+        if self._is_stale(entry):
+            self.refresh(key, wait=self.budget if entry.value is None else None)
+        return entry.value, self.info(key)
+
+    def info(self, key):
+        entry = self._entry(key)
+        with self.lock:
+            age = (datetime.now() - entry.fetched_at).total_seconds() if entry.fetched_at else None
+            return {
+                "fetched_at": entry.fetched_at,
+                "age": age,
+                "source": entry.source,
+                "stale": entry.source != "live" or age is None or age > self.ttl,
+                "refreshing": entry.thread is not None,
+                "error": entry.error,
+                "failures": entry.failures,
+            }
+
+    def warm(self, keys):
+        # 아직 받은 적 없거나 TTL 이 지난 키만 갱신 (신선한 데이터는 그대로 사용)
+        for key in keys:
+            if self._is_stale(self._entry(key)):
+                self.refresh(key)
+
+
+# -----------------------------------------------------------------------------
+# 시세 + 지표 프레임 캐시
+# -----------------------------------------------------------------------------
+def _load_frame(key, offline=False):
+    ticker, years = key
+    # 온라인이면 다운로드 실패 시 FetchError → SWRCache 가 이전 값 유지 + 백오프
+    raw = data_cache.load_history(ticker, years=years, offline=offline, strict=not offline)
+    if raw is None or len(raw) < data_cache.MIN_ROWS:
+        return None
+    # 모든 세션이 복사 없이 같이 읽는 읽기 전용 프레임 (hunter/shared_store.py)
+    return indicators.compute_incremental(ticker, raw, finish=shared_store.freeze)
+
+
+MARKET = SWRCache(_load_frame, fallback=lambda key: _load_frame(key, offline=True),
+                  stamp=lambda key: data_cache.cached_at(key[0]))
+
+
+def get_frame(ticker="SOXL", years=3):
+    # 공유 프레임은 그대로 두고 호출마다 얕은 복사본을 반환 (열 추가가 다른 세션에 새지 않도록)
+    value, info = MARKET.get((ticker, years))
+    return shared_store.view(value), info
+
+
+def refresh_frame(ticker="SOXL", years=3, wait=FETCH_BUDGET):
+    MARKET.refresh((ticker, years), wait=wait, force=True)
+    return get_frame(ticker, years)
+
+
+_warmed = set()
+
+
+def warm(tickers, years=3):
+    # Streamlit 은 위젯 클릭마다 스크립트를 다시 실행하므로 프로세스당 키별 한 번만
+    keys = [(t, years) for t in tickers if (t, years) not in _warmed]
+    _warmed.update(keys)
+    MARKET.warm(keys)
+
+
+# -----------------------------------------------------------------------------
+# 상장 전 합성 히스토리 포함 SOXL (hunter/synthetic.py), 하루 한 번 정도만 갱신하면 충분
+# -----------------------------------------------------------------------------
+EXTENDED_TTL = 6 * 3600
+
+
+def _load_extended(key, offline=False):
+    ticker, underlying = key
+    raw = synthetic.build_extended(ticker, underlying, offline=offline, strict=not offline)
+    if raw is None or len(raw) < data_cache.MIN_ROWS:
+        return None
+    return shared_store.freeze(indicators.add_indicators(raw.copy()))
+
+
+EXTENDED = SWRCache(_load_extended, fallback=lambda key: _load_extended(key, offline=True), ttl=EXTENDED_TTL,
+                    stamp=lambda key: data_cache.cached_at(synthetic.ext_ticker(key[0])))
+
+
+def get_extended(ticker="SOXL", underlying=synthetic.DEFAULT_UNDERLYING):
+    value, info = EXTENDED.get((ticker, underlying))
+    return shared_store.view(value), info
+
+
+if __name__ == "__main__":
+    # 서버 시작 전 디스크 캐시 예열: python -m hunter.live_cache SOXL TQQQ
+    for ticker in sys.argv[1:] or ["SOXL"]:
+        df = data_cache.load_history(ticker, years=3)
+        print(f"{ticker}: {0 if df is None else len(df)} bars")
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# rerun 단위 구간 계측
+# - lap(이름): 직전 lap 이후 경과 시간을 해당 구간으로 기록 (코드 들여쓰기를 바꾸지 않고 삽입)
+# - 선택 시 tracemalloc 으로 구간별 메모리 최대치도 기록
+# - rerun 이 끝나면 한 줄(JSON)로 METRICS_FILE 에 추가 → 페이지별 p50/p95 집계
+# -----------------------------------------------------------------------------
+METRICS_FILE = os.environ.get("HUNTER_METRICS", "hunter_metrics.jsonl")
+_write_lock = threading.Lock()
+
+
+class RerunMetrics:
+    def __init__(self, memory=False):
+        self.page = None
+        self.stages = {}
+        self.memory_kb = {}
+        self.cache = {}
+        self.memory = memory
+        self.t0 = self.last = time.perf_counter()
+        self.finished = None
+        if memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self.last) * 1000
+        self.last = now
+        if self.memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self.memory_kb[stage] = max(self.memory_kb.get(stage, 0.0), peak / 1024)
+            tracemalloc.reset_peak()
+
+    def cache_event(self, name, status):
+        self.cache[name] = status
+
+    def finish(self, path=None):
+        # 마지막 lap 이후 남은 시간은 "기타" 로, 한 rerun 에 한 번만 기록
+        if self.finished is not None:
+            return self.finished
+        if time.perf_counter() - self.last > 0:
+            self.lap("기타")
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "page": self.page,
+            "total_ms": sum(self.stages.values()),
+            "stages": self.stages,
+            "cache": self.cache,
+        }
+        if self.memory_kb:
+            record["peak_kb"] = self.memory_kb
+        self.finished = record
+        try:
+            with _write_lock, open(path or METRICS_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # 계측 실패가 앱을 멈추게 하지 않음
+        return record
+
+
+def load_records(path=None, limit=5000):
+    path = path or METRICS_FILE
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()[-limit:]
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def latency_summary(records):
+    # 페이지별 rerun 수 / 전체 p50·p95 / 구간별 p95 (ms)
+    if not records:
+        return pd.DataFrame()
+    stages = pd.DataFrame([r["stages"] for r in records])
+    stages["전체"] = [r["total_ms"] for r in records]
+    stages["page"] = [r.get("page") or "-" for r in records]
+    grouped = stages.groupby("page")
+    parts = {
+        "rerun 수": grouped.size(),
+        "p50(ms)": grouped["전체"].median(),
+        "p95(ms)": grouped["전체"].quantile(0.95),
+    }
+    for col in stages.columns.drop(["전체", "page"]):
+        parts[f"{col} p95"] = grouped[col].quantile(0.95)
+    return pd.DataFrame(parts)
+
+
+def cache_hit_rate(records, name):
+    statuses = [r["cache"].get(name) for r in records if r.get("cache", {}).get(name)]
+    if not statuses:
+        return np.nan
+    return sum(s == "hit" for s in statuses) / len(statuses) * 100
@@ -0,0 +1,118 @@
+import pandas as pd
+
+from hunter.indicators import RSI_WINDOWS, calculate_rsi
+
+# -----------------------------------------------------------------------------
+# 지표 의존 그래프 (필요한 열만 요청 시 계산)
+# - 각 지표는 입력 열 / 자체 lookback(첫 유효값 전에 필요한 과거 봉 수)을 선언
+# - Lazy: 요청한 열과 그 입력만 한 번씩 계산해 메모 (delta 는 RSI 3종, Return 은 Sigma 2종이 공유)
+# - tail=K: 마지막 K 행만 필요할 때 누적 lookback 만큼만 잘라서 계산
+#   (Wilder RSI 는 무한 기억이므로 전체 계산과의 차이가 1e-5 포인트 아래가 되는 수렴 구간을 lookback 으로 사용)
+# Series(단일 티커) / DataFrame(날짜 × 티커 패널) 모두 같은 식으로 동작
+# 지표 식은 여기에만 두고, indicators.indicator_columns(전체 계산)도 이 그래프를 tail 없이 평가
+# -----------------------------------------------------------------------------
+BASE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+RSI_SETTLE = 15  # Wilder 평균 수렴 구간 = window × 15 봉 ((1 - 1/14)^210 ≈ 2e-7)
+
+
+class Node:
+    def __init__(self, name, inputs, lookback, fn):
+        self.name = name
+        self.inputs = inputs
+        self.lookback = lookback
+        self.fn = fn
+
+
+REGISTRY = {}
+
+
+def register(name, inputs, lookback=0):
+    def wrap(fn):
+        REGISTRY[name] = Node(name, inputs, lookback, fn)
+        return fn
+    return wrap
+
+
+def _rolling_mean(w):
+    return lambda x: x.rolling(window=w).mean()
+
+
+def _sigma(w):
+    return lambda ret: (ret - ret.rolling(window=w).mean()) / ret.rolling(window=w).std()
+
+
+register("delta", ["Close"], 1)(lambda close: close.diff())
+register("Return", ["Close"], 1)(lambda close: close.pct_change())
+for _w in (20, 120, 200):
+    register(f"MA{_w}", ["Close"], _w - 1)(_rolling_mean(_w))
+register("BB_Mid", ["MA20"])(lambda ma20: ma20)
+register("BB_Std", ["Close"], 19)(lambda close: close.rolling(window=20).std())
+register("BB_Lower", ["BB_Mid", "BB_Std"])(lambda mid, std: mid - 2 * std)
+
+
+@register("Pct_B", ["Close", "BB_Mid", "BB_Std", "BB_Lower"])
+def _pct_b(close, mid, std, lower):
+    denom = (mid + 2 * std) - lower
+    return ((close - lower) / denom).where(denom != 0, 0)
+
+
+for _col, _w in RSI_WINDOWS.items():
+    register(_col, ["delta"], _w * RSI_SETTLE)(lambda delta, w=_w: calculate_rsi(delta, w))
+register("Sigma", ["Return"], 19)(_sigma(20))
+register("Sigma60", ["Return"], 59)(_sigma(60))
+register("VolMA20", ["Volume"], 19)(_rolling_mean(20))
+register("Vol_Ratio", ["Volume", "VolMA20"])(lambda volume, ma: volume / ma)
+register("Is_Yangbong", ["Close", "Open"])(lambda close, open_: close > open_)
+
+
+def lookback(name):
+    # 이 열의 마지막 값을 정확히 얻기 위해 필요한 누적 과거 봉 수
+    node = REGISTRY.get(name)
+    if node is None:
+        return 0
+    return node.lookback + max((lookback(i) for i in node.inputs), default=0)
+
+
+class LazyIndicators:
+    def __init__(self, data, tail=None, names=None):
+        # data: OHLCV DataFrame 또는 {필드: 날짜 × 티커 DataFrame} 패널
+        # tail 을 쓰려면 names(이후 요청할 열)를 미리 알려 잘라낼 길이를 정함
+        self.tail = tail
+        n = len(data['Close'])
+        start = 0
+        if tail is not None:
+            need = max((lookback(c) for c in names or REGISTRY), default=0)
+            start = max(0, n - tail - need)
+        self.data = {c: data[c].iloc[start:] for c in BASE_COLUMNS if c in data}
+        self.memo = {}
+
+    def get(self, name):
+        if name in self.memo:
+            return self.memo[name]
+        if name in self.data:
+            value = self.data[name]
+        else:
+            node = REGISTRY[name]
+            value = node.fn(*[self.get(i) for i in node.inputs])
+        self.memo[name] = value
+        return value
+
+    def _cut(self, value):
+        return value if self.tail is None else value.iloc[-self.tail:]
+
+    def frame(self, names):
+        # 단일 티커: 요청한 열만 담은 DataFrame
+        return pd.DataFrame({c: self._cut(self.get(c)) for c in names})
+
+    def panel(self, names):
+        # 패널: {열: 날짜 × 티커 DataFrame}
+        return {c: self._cut(self.get(c)) for c in names}
+
+    @property
+    def computed(self):
+        return [c for c in self.memo if c in REGISTRY]
+
+
+def compute(data, names, tail=None):
+    lazy = LazyIndicators(data, tail, names)
+    return lazy.panel(names) if isinstance(data, dict) else lazy.frame(names)
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from hunter import data_cache, shared_store
+
+# -----------------------------------------------------------------------------
+# 백테스트 결과 디스크 캐시 (내용 주소 방식)
+# - 키 = 가격 데이터 지문 + 규칙/파라미터 + 계산 코드 버전 + 정밀도 모드(HUNTER_COMPACT)의 해시
+#   새 봉이 들어오면 해당 가격 지문을 쓰는 항목만 새 키가 되고, 나머지는 그대로 재사용
+# - 파일 하나당 결과 하나 (pickle), 읽을 때마다 mtime 갱신 → 용량 초과 시 오래된 것부터 삭제 (LRU)
+# - 같은 프로세스의 최근 결과는 메모리에도 보관해 rerun 때 디스크도 읽지 않음
+# -----------------------------------------------------------------------------
+RESULT_DIR = os.path.join(data_cache.CACHE_DIR, "results")
+MAX_BYTES = int(float(os.environ.get("HUNTER_RESULT_CACHE_MB", "200")) * 1024 * 1024)
+MEMORY_ITEMS = 16
+CODE_MODULES = ["backtest", "signals", "indicators", "registry", "simulator", "timeframes"]
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+
+
+def _code_version():
+    # 결과를 만드는 모듈 소스가 바뀌면 이전 결과를 쓰지 않도록
+    h = hashlib.sha1()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in CODE_MODULES:
+        with open(os.path.join(base, f"{name}.py"), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+CODE_VERSION = _code_version()
+
+
+def fingerprint(df, columns=("Open", "Close", "Volume")):
+    h = hashlib.sha1(pd.DatetimeIndex(df.index).asi8.tobytes())
+    for col in columns:
+        h.update(np.ascontiguousarray(df[col].to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def make_key(*parts):
+    # HUNTER_COMPACT(float32 지표)는 임계값 비교 결과를 바꿀 수 있으므로 키에 포함
+    return hashlib.sha1(repr((CODE_VERSION, shared_store.COMPACT) + parts).encode()).hexdigest()
+
+
+def _path(key):
+    return os.path.join(RESULT_DIR, f"{key}.pkl")
+
+
+def _remember(key, value):
+    _memory[key] = value
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ITEMS:
+        _memory.popitem(last=False)
+
+
+def get(key):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        os.utime(path)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    with _lock:
+        _remember(key, value)
+    return value
+
+
+def put(key, value, max_bytes=MAX_BYTES):
+    with _lock:
+        _remember(key, value)
+    try:
+        os.makedirs(RESULT_DIR, exist_ok=True)
+        tmp = _path(key) + f".{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _path(key))
+        evict(max_bytes)
+    except OSError:
+        pass  # 캐시 실패는 결과에 영향 없음
+
+
+def evict(max_bytes=MAX_BYTES):
+    entries = []
+    for name in os.listdir(RESULT_DIR):
+        if name.endswith(".pkl"):
+            st = os.stat(os.path.join(RESULT_DIR, name))
+            entries.append((st.st_mtime, st.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(RESULT_DIR, name))
+        except OSError:
+            continue
+        total -= size
+
+
+def cached(key, compute):
+    value = get(key)
+    if value is None:
+        value = compute()
+        put(key, value)
+    return value
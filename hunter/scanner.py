@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from hunter import data_cache, indicators, signals
+
+# -----------------------------------------------------------------------------
+# 멀티 티커 신호 스캐너
+# 유니버스 전체를 배치로 받아 날짜 × 티커 패널로 지표/등급 조건을 한 번에 평가
+# -----------------------------------------------------------------------------
+DEFAULT_UNIVERSE = [
+    "SOXL", "SOXS", "TQQQ", "SQQQ", "TECL", "TECS", "LABU", "LABD", "FNGU", "FNGD",
+    "UPRO", "SPXL", "SPXU", "UDOW", "SDOW", "TNA", "TZA", "URTY", "SRTY", "FAS",
+    "FAZ", "CURE", "DFEN", "DPST", "DRN", "DRV", "NAIL", "RETL", "WEBL", "WEBS",
+    "HIBL", "HIBS", "MIDU", "UTSL", "PILL", "TPOR", "WANT", "BULZ", "BERZ", "NUGT",
+    "DUST", "JNUG", "JDST", "GUSH", "DRIP", "ERX", "ERY", "YINN", "YANG", "EDC",
+    "EDZ", "TMF", "TMV", "USD", "ROM", "QLD", "SSO", "UWM", "UYG", "BOIL", "KOLD",
+]
+SUMMARY_COLUMNS = ["Close", "Return", "Sigma", "Sigma60", "RSI", "RSI2", "Vol_Ratio", "Pct_B"]
+
+
+def scan_panel(panel):
+    ind = indicators.panel_indicators(panel)
+    masks = signals.tier_masks(ind)
+    codes = signals.tier_codes(masks)  # 날짜 × 티커 (전체 히스토리 한 번에)
+
+    # 티커마다 마지막으로 종가가 있는 날을 '오늘'로 사용 (상장폐지/거래정지 티커 대응)
+    close = ind['Close'].to_numpy()
+    valid = ~np.isnan(close)
+    has_data = valid.any(axis=0)
+    last_row = len(close) - 1 - np.argmax(valid[::-1], axis=0)
+    cols = np.arange(close.shape[1])
+
+    table = pd.DataFrame(
+        {c: ind[c].to_numpy()[last_row, cols] for c in SUMMARY_COLUMNS},
+        index=ind['Close'].columns,
+    )
+    table.insert(0, "Date", ind['Close'].index[last_row])
+    code = codes[last_row, cols]
+    labels = np.array([signals.TIER_LABELS[t] for t in signals.TIERS] + ["-"], dtype=object)
+    table.insert(1, "Tier", labels[code])
+    table["Rank"] = np.where(code >= 0, code, len(signals.TIERS))
+    table = table[has_data]
+
+    # 등급 우선, 같은 등급 안에서는 Sigma 가 낮을수록(과매도) 위로
+    table = table.sort_values(["Rank", "Sigma"], na_position="last").drop(columns="Rank")
+    table.index.name = "Ticker"
+    return table
+
+
+def scan_universe(tickers=DEFAULT_UNIVERSE, years=3, offline=False, signals_only=False):
+    frames = data_cache.load_panel(tickers, years=years, offline=offline)
+    if not frames:
+        return None
+    table = scan_panel(data_cache.to_panel(frames))
+    if signals_only:
+        table = table[table["Tier"] != "-"]
+    return table
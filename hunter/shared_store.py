@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 세션 공유용 읽기 전용 프레임
+# - 열마다 독립된 NumPy 배열(쓰기 금지)로 한 번만 만들고 모든 세션이 같은 객체를 참조
+#   (st.cache_data 처럼 rerun 마다 피클/언피클 복사본을 만들지 않음)
+# - 슬라이스(iloc[-120:])나 to_numpy() 는 복사 없이 같은 버퍼를 가리킴
+# - 공유 프레임 자체에 값을 쓰면 ValueError(read-only), 열 추가는 모든 세션에 보이므로
+#   호출 측에는 copy(deep=False) 로 요청마다 별도 프레임 객체를 줌 (live_cache.get_frame)
+#   → 열 추가는 그 복사본에만, 값 쓰기는 Copy-on-Write 로 해당 열만 복사된 뒤 반영
+# - compact=True: 정밀도가 덜 중요한 지표 열은 float32, 양봉 여부는 bool 로 저장
+#   (가격/이동평균/밴드 하단은 손절가·표시용이라 float64 유지)
+# -----------------------------------------------------------------------------
+COMPACT = os.environ.get("HUNTER_COMPACT", "0") == "1"
+COMPACT_FLOAT_COLUMNS = ["BB_Std", "Pct_B", "RSI", "RSI5", "RSI2", "Return", "Sigma", "Sigma60", "VolMA20", "Vol_Ratio"]
+BOOL_COLUMNS = ["Is_Yangbong"]
+
+
+def freeze(df, compact=COMPACT):
+    cols = {}
+    for col in df.columns:
+        if col in BOOL_COLUMNS:
+            arr = df[col].to_numpy(dtype=bool)
+        elif compact and col in COMPACT_FLOAT_COLUMNS:
+            arr = df[col].to_numpy(dtype=np.float32)
+        else:
+            arr = df[col].to_numpy(copy=True)
+        arr.flags.writeable = False
+        cols[col] = arr
+    out = pd.DataFrame(cols, index=df.index, copy=False)
+    out.attrs.update(df.attrs)
+    return out
+
+
+def view(df):
+    # 세션/요청별 얕은 복사 (데이터 버퍼는 공유, 프레임 객체만 새로)
+    return None if df is None else df.copy(deep=False)
+
+
+def nbytes(df):
+    return int(df.memory_usage(index=True).sum())
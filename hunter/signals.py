@@ -0,0 +1,75 @@
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# 매수 신호 등급 조건 (백테스트 기준)
+# 단일 티커 DataFrame / 날짜 × 티커 패널(dict of DataFrame) 모두 같은 식으로 평가
+# -----------------------------------------------------------------------------
+TIERS = ["dia", "gold", "silver", "blitz"]
+TIER_LABELS = {"dia": "💎 다이아", "gold": "🥇 골드", "silver": "🥈 실버", "blitz": "⚡ 블리츠"}
+
+
+# 등급 조건 임계값 (파라미터 스윕에서 덮어쓸 수 있음)
+DEFAULT_RULES = {
+    "dia_sigma": -2.5,
+    "gold_sigma": -2.0,
+    "gold_dual_sigma": -1.8,
+    "gold_dual_sigma60": -2.0,
+    "rsi_oversold": 30,
+    "vol_ratio": 1.5,
+    "silver_rsi": 45,
+    "silver_pct_b": 0.2,
+    "blitz_rsi2": 5,
+}
+
+
+# tier_masks 가 읽는 열 (필요한 지표만 계산할 때 사용)
+MASK_COLUMNS = ["Close", "RSI", "RSI2", "Vol_Ratio", "Sigma", "Sigma60", "Pct_B", "MA120", "MA200", "Is_Yangbong"]
+
+
+def tier_masks(ind, rules=None):
+    # ind 는 DataFrame / 패널 dict / NumPy 배열 dict 어느 것이든 가능
+    r = DEFAULT_RULES if rules is None else {**DEFAULT_RULES, **rules}
+    oversold = (ind['RSI'] < r["rsi_oversold"]) & (ind['Vol_Ratio'] >= r["vol_ratio"])
+    cond_dia = (ind['Sigma'] <= r["dia_sigma"]) & oversold
+    cond_gold_std = (ind['Sigma'] <= r["gold_sigma"]) & oversold
+    cond_gold_dual = (ind['Sigma'] <= r["gold_dual_sigma"]) & (ind['Sigma60'] <= r["gold_dual_sigma60"])
+    cond_gold = (cond_gold_std | cond_gold_dual) & (~cond_dia)
+    cond_silver = (ind['RSI'] < r["silver_rsi"]) & (ind['Pct_B'] < r["silver_pct_b"]) & (ind['Close'] > ind['MA120']) & (ind['Is_Yangbong']) & (~cond_dia) & (~cond_gold)
+    cond_blitz = (ind['RSI2'] < r["blitz_rsi2"]) & (ind['Close'] > ind['MA200'])
+    return {"dia": cond_dia, "gold": cond_gold, "silver": cond_silver, "blitz": cond_blitz}
+
+
+def tier_codes(masks):
+    # 우선순위(다이아 > 골드 > 실버 > 블리츠)대로 한 칸에 하나의 등급: 0~3, 신호 없음 -1
+    return np.select([np.asarray(masks[t], dtype=bool) for t in TIERS], range(len(TIERS)), default=-1)
+
+
+def tier_label_array(masks, default="기타"):
+    labels = np.array([TIER_LABELS[t] for t in TIERS] + [default], dtype=object)
+    return labels[tier_codes(masks)]
+
+
+# -----------------------------------------------------------------------------
+# 매매 규칙 (대시보드 기준)
+# 비중: 다이아 80% / 골드 50% / 실버 20% (Hunter 예수금), 블리츠는 Blitz 예수금 사용
+# 손절: 고점 × 0.6 / 0.8 / 0.85 트레일링, 그 외 등급은 매수가 × 0.85
+# 다이아는 5일 강제 보유
+# -----------------------------------------------------------------------------
+POSITION_SIZE = {"dia": 0.8, "gold": 0.5, "silver": 0.2, "blitz": 1.0}
+TRAILING_STOP = {"dia": 0.6, "gold": 0.8, "silver": 0.85}
+FIXED_STOP = 0.85
+MIN_HOLD_DAYS = {"dia": 5}
+WALLET_KEY = {"dia": "hunter_cash", "gold": "hunter_cash", "silver": "hunter_cash", "blitz": "blitz_cash"}
+
+
+def tier_from_label(label):
+    # "💎 다이아" 같은 화면/장부 라벨 → "dia" (해당 없으면 "etc")
+    for tier, name in TIER_LABELS.items():
+        if name.split()[-1] in label:
+            return tier
+    return "etc"
+
+
+def stop_price(tier, entry, peak):
+    ratio = TRAILING_STOP.get(tier)
+    return peak * ratio if ratio is not None else entry * FIXED_STOP
@@ -0,0 +1,152 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from hunter import backtest, signals
+
+# -----------------------------------------------------------------------------
+# 경로 의존 포트폴리오 시뮬레이터
+# 대시보드의 비중/트레일링 스탑/다이아 5일 보유 규칙과 Hunter·Blitz 두 예수금으로
+# 히스토리를 한 번에 재생 (봉당 O(보유 로트 수), 상태는 고정 크기 배열)
+# -----------------------------------------------------------------------------
+TRADE_COLUMNS = ["등급", "매수일", "매수가", "수량", "매도일", "매도가", "수익률(%)", "보유일", "사유"]
+
+
+def simulate_arrays(close, codes, hunter_cash=700.0, blitz_cash=300.0, warmup=backtest.WARMUP_BARS, max_hold=None):
+    # close: 종가 배열, codes: signals.tier_codes 결과 (-1 = 신호 없음)
+    # 반환: (hunter 예수금, blitz 예수금, 보유 평가액) 배열과 체결 목록
+    max_hold = max_hold or {}
+    tiers = signals.TIERS
+    n_tiers = len(tiers)
+    size = [signals.POSITION_SIZE[t] for t in tiers]
+    trail = [signals.TRAILING_STOP.get(t, 0.0) for t in tiers]
+    min_hold = [signals.MIN_HOLD_DAYS.get(t, 0) for t in tiers]
+    hold_cap = [max_hold.get(t, 0) for t in tiers]
+    wallet = [1 if signals.WALLET_KEY[t] == "blitz_cash" else 0 for t in tiers]
+    fixed_stop = signals.FIXED_STOP
+
+    close_l = np.asarray(close, dtype=float).tolist()
+    codes_l = np.asarray(codes).tolist()
+    n = len(close_l)
+
+    # 로트 상태 (최대 로트 수 = 신호 수)
+    cap = max(1, sum(1 for c in codes_l if c >= 0))
+    lot_tier = [0] * cap
+    lot_qty = [0] * cap
+    lot_entry = [0.0] * cap
+    lot_peak = [0.0] * cap
+    lot_bar = [0] * cap
+    n_lots = 0
+    open_lots = []
+
+    cash = [float(hunter_cash), float(blitz_cash)]
+    open_qty = [0, 0]
+    cash_h = np.empty(n)
+    cash_b = np.empty(n)
+    pos_val = np.empty(n)
+    trades = []
+
+    for i in range(n):
+        c = close_l[i]
+        if c != c:  # NaN 종가 (거래 없음)
+            cash_h[i], cash_b[i] = cash
+            pos_val[i] = pos_val[i - 1] if i else 0.0
+            continue
+
+        # 1) 보유 로트 청산 판단
+        if open_lots:
+            still_open = []
+            for k in open_lots:
+                t = lot_tier[k]
+                if c > lot_peak[k]:
+                    lot_peak[k] = c
+                held = i - lot_bar[k]
+                reason = None
+                if held >= min_hold[t]:
+                    stop = lot_peak[k] * trail[t] if trail[t] else lot_entry[k] * fixed_stop
+                    if c <= stop:
+                        reason = "트레일링 스탑" if trail[t] else "손절"
+                    elif hold_cap[t] and held >= hold_cap[t]:
+                        reason = "기간 만료"
+                if reason is None:
+                    still_open.append(k)
+                    continue
+                w = wallet[t]
+                cash[w] += lot_qty[k] * c
+                open_qty[w] -= lot_qty[k]
+                trades.append((t, lot_bar[k], lot_entry[k], lot_qty[k], i, c, reason))
+            open_lots = still_open
+
+        # 2) 신호 봉 종가에 매수 (수량은 정수 주)
+        code = codes_l[i]
+        if 0 <= code < n_tiers and i >= warmup:
+            w = wallet[code]
+            qty = int(cash[w] * size[code] // c)
+            if qty > 0:
+                cash[w] -= qty * c
+                open_qty[w] += qty
+                k = n_lots
+                n_lots += 1
+                lot_tier[k], lot_qty[k], lot_entry[k], lot_peak[k], lot_bar[k] = code, qty, c, c, i
+                open_lots.append(k)
+
+        cash_h[i], cash_b[i] = cash
+        pos_val[i] = (open_qty[0] + open_qty[1]) * c
+
+    # 마지막 봉에 남은 로트는 미청산으로 기록
+    for k in open_lots:
+        trades.append((lot_tier[k], lot_bar[k], lot_entry[k], lot_qty[k], -1, math.nan, "보유중"))
+    return cash_h, cash_b, pos_val, trades
+
+
+def years_between(index):
+    return max((index[-1] - index[0]).days / 365.25, 1 / 365.25)
+
+
+def performance(equity, years):
+    equity = np.asarray(equity, dtype=float)
+    peak = np.maximum.accumulate(equity)
+    drawdown = equity / peak - 1
+    start, end = equity[0], equity[-1]
+    cagr = (end / start) ** (1 / years) - 1 if start > 0 and end > 0 else math.nan
+    return {
+        "최종 자산": end,
+        "총 수익률(%)": (end / start - 1) * 100 if start > 0 else math.nan,
+        "CAGR(%)": cagr * 100,
+        "최대 낙폭(%)": drawdown.min() * 100,
+    }, drawdown
+
+
+def simulate(df, hunter_cash=700.0, blitz_cash=300.0, rules=None, codes=None, warmup=backtest.WARMUP_BARS, max_hold=None):
+    if codes is None:
+        codes = signals.tier_codes(signals.tier_masks(df, rules))
+    cash_h, cash_b, pos_val, raw_trades = simulate_arrays(
+        df['Close'].to_numpy(dtype=float), codes, hunter_cash, blitz_cash, warmup, max_hold
+    )
+    equity = cash_h + cash_b + pos_val
+    stats, drawdown = performance(equity, years_between(df.index))
+
+    curve = pd.DataFrame({
+        "Hunter 예수금": cash_h,
+        "Blitz 예수금": cash_b,
+        "보유 평가액": pos_val,
+        "총 자산": equity,
+        "낙폭(%)": drawdown * 100,
+    }, index=df.index)
+
+    dates = df.index.strftime('%Y-%m-%d')
+    labels = [signals.TIER_LABELS[t] for t in signals.TIERS]
+    rows = []
+    for t, b_in, p_in, qty, b_out, p_out, reason in raw_trades:
+        rows.append((
+            labels[t], dates[b_in], p_in, qty,
+            dates[b_out] if b_out >= 0 else "", p_out,
+            (p_out / p_in - 1) * 100, (b_out - b_in) if b_out >= 0 else len(df) - 1 - b_in, reason,
+        ))
+    trades = pd.DataFrame(rows, columns=TRADE_COLUMNS).sort_values("매수일", ignore_index=True)
+
+    closed = trades[trades["사유"] != "보유중"]
+    stats["거래 수"] = len(closed)
+    stats["승률(%)"] = (closed["수익률(%)"] > 0).mean() * 100 if len(closed) else math.nan
+    return curve, trades, stats
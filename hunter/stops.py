@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from hunter import signals
+
+# -----------------------------------------------------------------------------
+# 보유 로트 트레일링 스탑
+# 종가의 뒤쪽 누적 최댓값(suffix max)을 한 번 만들어 두면
+# "매수일 이후 최고가" 는 위치 하나로 O(1) 조회 → 모든 로트를 한 번에 계산
+# -----------------------------------------------------------------------------
+
+
+def suffix_max(values):
+    # out[i] = max(values[i:]) (NaN 무시)
+    values = np.asarray(values, dtype=float)
+    return np.fmax.accumulate(values[::-1])[::-1]
+
+
+class PeakIndex:
+    def __init__(self, index, close):
+        self.index = pd.DatetimeIndex(index)
+        self.peaks = suffix_max(close)
+
+    def peak_since(self, dates):
+        # 각 날짜 이후(당일 포함) 첫 봉부터 마지막 봉까지의 최고 종가, 해당 봉이 없으면 NaN
+        dates = pd.to_datetime(pd.Index(dates, dtype=object), errors="coerce")
+        pos = self.index.searchsorted(dates, side="left")
+        out = np.full(len(pos), np.nan)
+        ok = (pos < len(self.peaks)) & ~dates.isna()
+        out[ok] = self.peaks[pos[ok]]
+        return out
+
+
+def stop_levels(peak_index, entry_dates, tier_labels, entry_prices, current_price):
+    # 대시보드 규칙: 고점 × (0.6 / 0.8 / 0.85), 그 외 등급은 매수가 × 0.85
+    dates = pd.to_datetime(pd.Index(entry_dates, dtype=object), errors="coerce")
+    peaks = peak_index.peak_since(dates)
+    peaks = np.where(np.isnan(peaks), current_price, np.fmax(peaks, current_price))
+    ratios = np.array([signals.TRAILING_STOP.get(signals.tier_from_label(t), np.nan) for t in tier_labels], dtype=float)
+    entry_prices = np.asarray(entry_prices, dtype=float)
+    stops = np.where(np.isnan(ratios), entry_prices * signals.FIXED_STOP, peaks * ratios)
+    stops[dates.isna()] = np.nan  # 날짜를 읽을 수 없는 로트는 표시하지 않음
+    return peaks, stops
+
+
+# -----------------------------------------------------------------------------
+# 보유 로트 표 (위젯 행 대신 한 번에 계산해 표 하나로 표시)
+# -----------------------------------------------------------------------------
+HOLDING_COLUMNS = ["매수일", "등급", "평단", "수량", "매입금액", "평가금액", "손익", "수익률(%)", "고점", "스탑", "스탑 이탈"]
+
+
+def holdings_frame(holdings, peak_index, current_price):
+    # holdings: ledger.load_holdings() 결과, 인덱스는 거래 id
+    if not holdings:
+        return pd.DataFrame(columns=HOLDING_COLUMNS)
+    lots = pd.DataFrame(holdings).set_index("id")
+    peaks, stops = stop_levels(peak_index, lots["date"], lots["tier"], lots["price"], current_price)
+    price = lots["price"].to_numpy(dtype=float)
+    qty = lots["qty"].to_numpy(dtype=int)
+    cost = price * qty
+    value = qty * float(current_price)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = (current_price - price) / price * 100
+    return pd.DataFrame({
+        "매수일": lots["date"].to_numpy(),
+        "등급": lots["tier"].to_numpy(),
+        "평단": price,
+        "수량": qty,
+        "매입금액": cost,
+        "평가금액": value,
+        "손익": value - cost,
+        "수익률(%)": pct,
+        "고점": peaks,
+        "스탑": stops,
+        "스탑 이탈": current_price <= stops,
+    }, index=lots.index)
+
+
+def tier_totals(frame):
+    # 등급별 + 전체 합계 행 (수익률은 매입금액 가중)
+    if frame.empty:
+        return pd.DataFrame(columns=["로트 수", "수량", "매입금액", "평가금액", "손익", "수익률(%)"])
+    g = frame.groupby("등급", sort=False)
+    totals = pd.DataFrame({
+        "로트 수": g.size(),
+        "수량": g["수량"].sum(),
+        "매입금액": g["매입금액"].sum(),
+        "평가금액": g["평가금액"].sum(),
+        "손익": g["손익"].sum(),
+    })
+    totals.loc["합계"] = totals.sum()
+    totals["수익률(%)"] = totals["손익"] / totals["매입금액"].where(totals["매입금액"] != 0) * 100
+    return totals
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+from hunter import data_cache
+
+# -----------------------------------------------------------------------------
+# 상장 전 SOXL 합성 히스토리
+# - 기초 반도체 ETF/지수의 일간 수익률 × 3 (매일 리셋) 에서 운용보수와
+#   차입 비용((레버리지 - 1) × 금리)을 일할 차감해 레버리지 시계열을 벡터 계산
+# - 시가/고가/저가는 전일 종가 대비 기초자산 변화율을 같은 배수로 확대, 거래량은 기초자산 것을 사용
+#   Vol_Ratio 는 20일 평균 대비 비율이라 이어 붙인 직후 20봉은 두 티커 거래량이 섞임
+#   → 이음 구간에서 실제 SOXL 평균 거래량에 맞춰 합성 구간 거래량도 환산
+# - 실제 SOXL 첫 봉에서 가격을 이어 붙여 같은 Parquet 캐시 형식(SOXL_EXT)으로 저장하고,
+#   겹치는 구간에서 합성 vs 실제 괴리를 attrs["deviation"] 에 기록
+# -----------------------------------------------------------------------------
+REAL_TICKER = "SOXL"
+EXT_SUFFIX = "_EXT"
+DEFAULT_UNDERLYING = "SOXX"  # ^SOX 는 더 길지만 거래량이 없어 다이아/골드(거래량 조건) 판정 불가
+LEVERAGE = 3
+EXPENSE_RATIO = 0.0075
+FINANCING_RATE = 0.03
+TRADING_DAYS = 252
+HISTORY_YEARS = 40
+SPLICE_VOLUME_BARS = 20  # 거래량 환산 비율을 잡는 실제 첫 구간 (VolMA20 기간)
+
+
+def ext_ticker(ticker=REAL_TICKER):
+    return f"{ticker}{EXT_SUFFIX}"
+
+
+def daily_drag(leverage=LEVERAGE, expense=EXPENSE_RATIO, financing=FINANCING_RATE):
+    # financing 은 연 금리(float) 또는 날짜별 연 금리 Series
+    return (expense + (leverage - 1) * financing) / TRADING_DAYS
+
+
+def leveraged_ohlcv(under, leverage=LEVERAGE, expense=EXPENSE_RATIO, financing=FINANCING_RATE):
+    prev = under['Close'].shift(1)
+    drag = daily_drag(leverage, expense, financing)
+    if isinstance(drag, pd.Series):
+        drag = drag.reindex(under.index).ffill().fillna(0.0)
+    ret = (leverage * (under['Close'] / prev - 1) - drag).fillna(0.0)
+    close = np.cumprod(1 + ret.to_numpy())
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+
+    out = {}
+    for col in ("Open", "High", "Low"):
+        move = leverage * (under[col] / prev - 1)
+        out[col] = np.where(np.isnan(prev_close), close, prev_close * (1 + move.to_numpy()))
+    lev = pd.DataFrame({
+        "Open": out["Open"],
+        "High": np.maximum.reduce([out["High"], out["Open"], close]),
+        "Low": np.minimum.reduce([out["Low"], out["Open"], close]),
+        "Close": close,
+        "Volume": under['Volume'].to_numpy(dtype=float),
+    }, index=under.index)
+    return lev
+
+
+def deviation_report(synthetic, real):
+    # 겹치는 구간에서 합성 시계열이 실제 SOXL 을 얼마나 따라가는지
+    idx = synthetic.index.intersection(real.index)
+    if len(idx) < 2:
+        return {}
+    s_ret = synthetic['Close'].reindex(idx).pct_change().dropna()
+    r_ret = real['Close'].reindex(idx).pct_change().dropna()
+    diff = s_ret - r_ret
+    s_path = (1 + s_ret).cumprod()
+    r_path = (1 + r_ret).cumprod()
+    years = max((idx[-1] - idx[0]).days / 365.25, 1 / 365.25)
+    return {
+        "겹치는 기간": f"{idx[0]:%Y-%m-%d} ~ {idx[-1]:%Y-%m-%d}",
+        "겹치는 봉 수": int(len(idx)),
+        "일간 수익률 상관계수": float(s_ret.corr(r_ret)),
+        "추적 오차(연, %)": float(diff.std() * np.sqrt(TRADING_DAYS) * 100),
+        "평균 일간 차이(bp)": float(diff.mean() * 1e4),
+        "합성 CAGR(%)": float((s_path.iloc[-1] ** (1 / years) - 1) * 100),
+        "실제 CAGR(%)": float((r_path.iloc[-1] ** (1 / years) - 1) * 100),
+        "누적 가격 최대 괴리(%)": float(((s_path / r_path - 1).abs().max()) * 100),
+    }
+
+
+def splice(synthetic, real):
+    # 실제 첫 봉 종가에 맞춰 합성 가격을 환산하고 그 이전 구간만 붙임
+    first = real.index[0]
+    if first not in synthetic.index:
+        return real.copy()
+    scale = real['Close'].iloc[0] / synthetic.loc[first, 'Close']
+    pre = synthetic.loc[synthetic.index < first].copy()
+    pre[["Open", "High", "Low", "Close"]] *= scale
+
+    # 거래량: 실제 첫 SPLICE_VOLUME_BARS 봉의 평균 거래량 비율로 기초자산 거래량을 환산
+    head = real.index[:SPLICE_VOLUME_BARS].intersection(synthetic.index)
+    under_vol = synthetic.loc[head, 'Volume'].mean() if len(head) else np.nan
+    if under_vol > 0:
+        pre['Volume'] *= real.loc[head, 'Volume'].mean() / under_vol
+    return pd.concat([pre, real])
+
+
+def build_extended(ticker=REAL_TICKER, underlying=DEFAULT_UNDERLYING, leverage=LEVERAGE,
+                   expense=EXPENSE_RATIO, financing=FINANCING_RATE, offline=False, strict=False):
+    key = ext_ticker(ticker)
+    cached = data_cache.load_cached(key)
+    params = {"underlying": underlying, "leverage": leverage, "expense": expense,
+              "financing": financing if not isinstance(financing, pd.Series) else "series",
+              "volume": "scaled"}  # 거래량 환산 이전에 만든 캐시는 다시 생성
+    if offline:
+        return cached if cached is not None and cached.attrs.get("params") == params else None
+
+    under = data_cache.load_history(underlying, years=HISTORY_YEARS, strict=strict)
+    # 실제 SOXL 전체 기간은 대시보드용 캐시(3년)를 건드리지 않도록 따로 받음
+    real = data_cache.download_ohlcv(ticker, years=HISTORY_YEARS)
+    if under is None or real is None or len(real) < data_cache.MIN_ROWS:
+        if strict:
+            raise data_cache.FetchError(f"{underlying} / {ticker} 전체 기간 다운로드 실패")
+        return cached if cached is not None and cached.attrs.get("params") == params else None
+
+    lev = leveraged_ohlcv(under, leverage, expense, financing)
+    spliced = splice(lev, real)
+    spliced.attrs = {
+        "years": HISTORY_YEARS,
+        "params": params,
+        "synthetic_until": real.index[0].strftime("%Y-%m-%d"),
+        "deviation": deviation_report(lev, real),
+    }
+    data_cache.save_cached(key, spliced)
+    return spliced
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from hunter import data_cache, indicators
+
+# -----------------------------------------------------------------------------
+# 멀티 타임프레임 (이미 받은 봉을 리샘플링, 추가 다운로드 없음)
+# - 일봉 → 주봉/월봉, 인트라데이 1분/5분봉 → 1시간/4시간봉
+# - 같은 지표 세트를 타임프레임별로 계산 (티커@규칙 키로 증분 상태 유지 → 새 봉은 꼬리만 재계산)
+# - 원래 인덱스로 되돌릴 때는 "완성된" 상위 봉만, 그 봉의 마지막 하위 봉 시각부터 사용 (lookahead 없음)
+#   데이터 끝의 진행 중인 주/월은 다음 기간의 첫 봉이 들어와야 완성으로 간주
+# -----------------------------------------------------------------------------
+TIMEFRAMES = {"W": "W-FRI", "M": "ME", "4h": "4h", "1h": "1h"}
+TIMEFRAME_LABELS = {"W": "주봉", "M": "월봉", "4h": "4시간봉", "1h": "1시간봉"}
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def resample_ohlcv(df, tf):
+    # 반환: (상위 봉 OHLCV, 각 상위 봉의 사용 가능 시각 = 그 기간의 마지막 하위 봉 시각)
+    rule = TIMEFRAMES.get(tf, tf)
+    cols = {c: a for c, a in AGG.items() if c in df.columns}
+    # 라벨 = 기간 끝 (주봉 금요일, 월봉 말일, 시간봉은 다음 정시)
+    bars = df[list(cols)].resample(rule, label="right").agg(cols)
+    avail = df.index.to_series().resample(rule, label="right").last()
+    keep = bars['Close'].notna().to_numpy()
+    bars, avail = bars[keep], avail[keep]
+
+    # 마지막 기간이 아직 진행 중이면 제외 (기간 끝 라벨이 마지막 하위 봉보다 뒤)
+    if len(bars) and bars.index[-1] > df.index[-1]:
+        bars, avail = bars.iloc[:-1], avail.iloc[:-1]
+    return bars, pd.DatetimeIndex(avail.to_numpy())
+
+
+def timeframe_indicators(df, tf, key=None):
+    # key 를 주면 compute_incremental 상태를 재사용 (예: "SOXL@W")
+    bars, avail = resample_ohlcv(df, tf)
+    if len(bars) < 2:
+        return bars, avail
+    if key is not None:
+        ind = indicators.compute_incremental(key, bars)
+    else:
+        ind = indicators.add_indicators(bars.copy())
+    return ind, avail
+
+
+def align(values, avail, index):
+    # 상위 봉 값 → 하위 인덱스: 각 시점에서 사용 가능한 가장 최근 완성 봉 (없으면 NaN)
+    pos = avail.searchsorted(pd.DatetimeIndex(index), side="right") - 1
+    out = {}
+    for col in values.columns:
+        arr = values[col].to_numpy(dtype=float)
+        aligned = np.full(len(pos), np.nan)
+        ok = pos >= 0
+        aligned[ok] = arr[pos[ok]]
+        out[col] = aligned
+    return pd.DataFrame(out, index=index)
+
+
+def multi_timeframe(df, tfs=("W", "M"), columns=("Sigma", "RSI", "Close", "MA20"), ticker=None):
+    # {"W_RSI": ..., "M_Sigma": ...} 처럼 접두어를 붙여 일봉 인덱스에 정렬한 프레임
+    parts = []
+    for tf in tfs:
+        ind, avail = timeframe_indicators(df, tf, key=f"{ticker}@{tf}" if ticker else None)
+        cols = [c for c in columns if c in ind.columns]
+        if len(ind) < 2 or not cols:
+            parts.append(pd.DataFrame({f"{tf}_{c}": np.nan for c in columns}, index=df.index))
+            continue
+        parts.append(align(ind[cols], avail, df.index).add_prefix(f"{tf}_"))
+    return pd.concat(parts, axis=1)
+
+
+def confirm_masks(masks, mtf, tf="W", max_rsi=None, max_sigma=None):
+    # 일봉 등급 조건 AND 상위 타임프레임 확인 조건 (NaN 이면 불충족)
+    cond = np.ones(len(mtf), dtype=bool)
+    if max_rsi is not None:
+        cond &= (mtf[f"{tf}_RSI"] < max_rsi).to_numpy()
+    if max_sigma is not None:
+        cond &= (mtf[f"{tf}_Sigma"] <= max_sigma).to_numpy()
+    return {t: np.asarray(m, dtype=bool) & cond for t, m in masks.items()}
+
+
+def load_intraday(ticker="SOXL", interval="1m"):
+    # 인트라데이 페이지에서 저장한 봉 파일 (없으면 None)
+    from hunter import intraday
+
+    path = os.path.join(data_cache.CACHE_DIR, f"{ticker}_{interval}.parquet")
+    return intraday.load_bars(path) if os.path.exists(path) else None
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hunter import indicators
+
+# 증분 계산(IncrementalIndicators / IndicatorEngine 스냅샷 복원)이 전체 벡터 계산과 같은지 확인
+RTOL = 1e-7
+ATOL = 1e-9
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(7)
+    n = 600
+    close = 40 * np.exp(np.cumsum(rng.normal(0, 0.03, n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) * 1.01,
+        "Low": np.minimum(open_, close) * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, n).astype(float),
+    }, index=pd.bdate_range("2020-01-02", periods=n, name="Date"))
+
+
+def assert_matches(actual, expected):
+    for col in indicators.INDICATOR_COLUMNS:
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+            rtol=RTOL, atol=ATOL, equal_nan=True, err_msg=col,
+        )
+
+
+def test_extend_matches_full(bars):
+    state = indicators.IncrementalIndicators()
+    state.extend(bars.iloc[:300])
+    for end in range(301, len(bars) + 1, 7):
+        out = state.extend(bars.iloc[:end])
+    out = state.extend(bars)
+    assert_matches(out, indicators.add_indicators(bars.copy()))
+
+
+def test_extend_rewrites_unfinished_bar(bars):
+    state = indicators.IncrementalIndicators()
+    partial = bars.copy()
+    partial.iloc[-1, partial.columns.get_loc("Close")] *= 1.05  # 장중 가격
+    state.extend(partial)
+    out = state.extend(bars)  # 같은 날짜의 최종 가격
+    assert_matches(out, indicators.add_indicators(bars.copy()))
+
+
+def test_extend_follows_trimmed_window(bars):
+    state = indicators.IncrementalIndicators()
+    state.extend(bars.iloc[:500])
+    buffers = state.buffers
+    out = state.extend(bars.iloc[5:505])  # 앞쪽 5봉이 밀려난 창 + 새 봉 5개
+    assert state.buffers is buffers  # 전체 재계산 없이 이어 씀
+    assert out.index[0] == bars.index[5] and len(out) == 500
+    assert_matches(out, indicators.add_indicators(bars.iloc[:505].copy()).iloc[5:])
+
+
+def test_changed_history_recomputes(bars):
+    state = indicators.IncrementalIndicators()
+    state.extend(bars.iloc[:500])
+    adjusted = bars.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.5  # 분할 등으로 과거 가격 전체 수정
+    assert_matches(state.extend(adjusted), indicators.add_indicators(adjusted.copy()))
+
+
+def test_engine_restore_matches_full(bars):
+    expected = indicators.add_indicators(bars.copy())
+    engine = indicators.IndicatorEngine.from_history(bars.iloc[:400])
+    engine = indicators.IndicatorEngine.restore(engine.snapshot())
+    rows = [engine.update(o, c, v) for o, c, v in zip(bars['Open'].iloc[400:], bars['Close'].iloc[400:], bars['Volume'].iloc[400:])]
+    assert_matches(pd.DataFrame(rows, index=bars.index[400:]), expected.iloc[400:])